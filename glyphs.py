@@ -0,0 +1,44 @@
+# glyphs.py - HD44780 CGRAM patterns, imported only where custom characters are loaded
+from micropython import const
+
+# LCD custom character definitions: one flat table of 5x8 CGRAM patterns, 8 bytes (rows) per
+# slot. Adjacent literals are joined by the compiler, so this is a single constant.
+_GLYPHS = (
+    # DYNAMIC_GLYPH_BASE + 0: Wifi nok, Valve nok, Boiler nok
+    b"\x19\x13\x00\x19\x13\x00\x19\x13"
+    # DYNAMIC_GLYPH_BASE + 1: Wifi ok, Valve nok, Boiler nok
+    b"\x1f\x1f\x00\x19\x13\x00\x19\x13"
+    # DYNAMIC_GLYPH_BASE + 2: Wifi nok, Valve ok, Boiler nok
+    b"\x19\x13\x00\x1f\x1f\x00\x19\x13"
+    # DYNAMIC_GLYPH_BASE + 3: Wifi nok, Valve nok, Boiler ok
+    b"\x19\x13\x00\x19\x13\x00\x1f\x1f"
+    # DYNAMIC_GLYPH_BASE + 4: Wifi ok, Valve nok, Boiler ok
+    b"\x1f\x1f\x00\x19\x13\x00\x1f\x1f"
+    # DYNAMIC_GLYPH_BASE + 5: Wifi nok, Valve ok, Boiler ok
+    b"\x19\x13\x00\x1f\x1f\x00\x1f\x1f"
+    # DYNAMIC_GLYPH_BASE + 6: Wifi ok, Valve ok, Boiler ok
+    b"\x1f\x1f\x00\x1f\x1f\x00\x1f\x1f"
+    # CUSTOM_GLYPH_BASE + 0: Lock
+    b"\x0e\x11\x11\x1f\x1f\x1b\x1b\x1f"
+    # CUSTOM_GLYPH_BASE + 1: Right Arrow '>'
+    b"\x08\x0c\x0e\x0f\x0e\x0c\x08\x00"
+    # CUSTOM_GLYPH_BASE + 2: (Empty placeholder)
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    # CUSTOM_GLYPH_BASE + 3: Boiler disconnected
+    b"\x00\x00\x1f\x00\x00\x1f\x00\x00"
+    # CUSTOM_GLYPH_BASE + 4: WiFi symbol (antenna)
+    b"\x0e\x11\x04\x0a\x00\x04\x04\x00"
+    # CUSTOM_GLYPH_BASE + 5: Valve OK
+    b"\x0e\x0e\x04\x0a\x0b\x0a\x04\x04"
+    # CUSTOM_GLYPH_BASE + 6: Valve Disconnected (striked)
+    b"\x00\x11\x0a\x04\x0a\x11\x00\x00"
+    # CUSTOM_GLYPH_BASE + 7: Boiler Connected
+    b"\x04\x08\x1f\x00\x00\x1f\x01\x02"
+)
+DYNAMIC_GLYPH_BASE = const(0)  # 7 WiFi/valve/boiler status combinations
+CUSTOM_GLYPH_BASE = const(7)   # 8 CGRAM slot glyphs, in slot order
+GLYPH_COUNT = const(15)
+
+def glyph(index):
+    """Returns the 8-byte pattern of glyph index as a zero-copy view into the table."""
+    return memoryview(_GLYPHS)[index * 8:index * 8 + 8]
@@ -3,6 +3,7 @@ Initialization module for OT-PID-UI-PICO.
 """
 
 import utime as time
+import uasyncio as asyncio
 from machine import reset
 
 # Project modules
@@ -27,18 +28,14 @@ from managers.manager_logger import Logger
 from controllers.controller_pid import PIDController
 from controllers.controller_feedforward import FeedforwardController
 from services.service_messageserver import MessageServer
-from platform_spec import (
-    DEFAULT_OT_MAX_HEATING_SETPOINT, DEFAULT_OT_MANUAL_HEATING_SETPOINT, DEFAULT_OT_DHW_SETPOINT,
-    DEFAULT_OT_ENABLE_CONTROLLER, DEFAULT_OT_ENABLE_HEATING, DEFAULT_OT_ENABLE_DHW, DEFAULT_OT_ENFORCE_DHW_SETPOINT,
-    DEFAULT_AUTOH_ENABLE, DEFAULT_AUTOH_OFF_TEMP, DEFAULT_AUTOH_OFF_VALVE_LEVEL, DEFAULT_AUTOH_ON_TEMP, DEFAULT_AUTOH_ON_VALVE_LEVEL,
-    DEFAULT_PID_KP, DEFAULT_PID_KI, DEFAULT_PID_KD, DEFAULT_PID_SETPOINT, DEFAULT_PID_MIN_HEATING_SETPOINT,
-    DEFAULT_PID_VALVE_MIN, DEFAULT_PID_VALVE_MAX, DEFAULT_PID_FF_WIND_COEFF, DEFAULT_PID_FF_TEMP_COEFF,
-    DEFAULT_PID_FF_SUN_COEFF, DEFAULT_PID_FF_WIND_CHILL_COEFF, DEFAULT_PID_BASE_TEMP_REF_OUTSIDE,
-    DEFAULT_PID_BASE_TEMP_BOILER, DEFAULT_PID_OUTPUT_DEADBAND, DEFAULT_PID_INTEGRAL_ACCUMULATION_RANGE
-)
 
 logger = Logger()
 
+# Set once services are up and the OpenTherm manager has started; gates the control loop
+ready_evt = asyncio.Event()
+# Set by WiFi and Homematic on a connection transition; wakes the connectivity task
+state_evt = asyncio.Event()
+
 
 # --------------------------------------------------------------------------- #
 #  Hardware Initialisation
@@ -90,59 +87,59 @@ def setup_gui(gui, cfg, wifi, hm, ot_manager, pid, heating_controller):
             Action("Rescan", hm.force_rescan),
         ]),
         Menu("OpenTherm", [
-            FloatField("Max Heating SP", cfg.get("OT", "MAX_HEATING_SETPOINT", DEFAULT_OT_MAX_HEATING_SETPOINT), lambda v: cfg.set("OT", "MAX_HEATING_SETPOINT", v)),
-            FloatField("Manual Heating SP", cfg.get("OT", "MANUAL_HEATING_SETPOINT", DEFAULT_OT_MANUAL_HEATING_SETPOINT), lambda v: cfg.set("OT", "MANUAL_HEATING_SETPOINT", v)),
-            FloatField("DHW Setpoint", cfg.get("OT", "DHW_SETPOINT", DEFAULT_OT_DHW_SETPOINT), lambda v: cfg.set("OT", "DHW_SETPOINT", v)),
-            BoolField("Takeover Control", cfg.get("OT", "ENABLE_CONTROLLER", DEFAULT_OT_ENABLE_CONTROLLER), lambda v: cfg.set("OT", "ENABLE_CONTROLLER", v)),
-            BoolField("Enable Heating", cfg.get("OT", "ENABLE_HEATING", DEFAULT_OT_ENABLE_HEATING), lambda v: cfg.set("OT", "ENABLE_HEATING", v)),
-            BoolField("Enable DHW", cfg.get("OT", "ENABLE_DHW", DEFAULT_OT_ENABLE_DHW), lambda v: cfg.set("OT", "ENABLE_DHW", v)),
-            BoolField("Enforce DHW SP", cfg.get("OT", "ENFORCE_DHW_SETPOINT", DEFAULT_OT_ENFORCE_DHW_SETPOINT), lambda v: cfg.set("OT", "ENFORCE_DHW_SETPOINT", v)),
+            FloatField("Max Heating SP", cfg.get("OT", "MAX_HEATING_SETPOINT"), lambda v: cfg.set("OT", "MAX_HEATING_SETPOINT", v)),
+            FloatField("Manual Heating SP", cfg.get("OT", "MANUAL_HEATING_SETPOINT"), lambda v: cfg.set("OT", "MANUAL_HEATING_SETPOINT", v)),
+            FloatField("DHW Setpoint", cfg.get("OT", "DHW_SETPOINT"), lambda v: cfg.set("OT", "DHW_SETPOINT", v)),
+            BoolField("Takeover Control", cfg.get("OT", "ENABLE_CONTROLLER"), lambda v: cfg.set("OT", "ENABLE_CONTROLLER", v)),
+            BoolField("Enable Heating", cfg.get("OT", "ENABLE_HEATING"), lambda v: cfg.set("OT", "ENABLE_HEATING", v)),
+            BoolField("Enable DHW", cfg.get("OT", "ENABLE_DHW"), lambda v: cfg.set("OT", "ENABLE_DHW", v)),
+            BoolField("Enforce DHW SP", cfg.get("OT", "ENFORCE_DHW_SETPOINT"), lambda v: cfg.set("OT", "ENFORCE_DHW_SETPOINT", v)),
         ]),
         Menu("Auto Heating", [
             Action("Trigger Turn ON", heating_controller.trigger_heating_on),
             Action("Trigger Turn OFF", heating_controller.trigger_heating_off),
-            BoolField("Enable Auto", cfg.get("AUTOH", "ENABLE", DEFAULT_AUTOH_ENABLE), lambda v: cfg.set("AUTOH", "ENABLE", v)),
-            FloatField("Off Temp >=", cfg.get("AUTOH", "OFF_TEMP", DEFAULT_AUTOH_OFF_TEMP), lambda v: cfg.set("AUTOH", "OFF_TEMP", v)),
-            FloatField("Off Valve <", cfg.get("AUTOH", "OFF_VALVE_LEVEL", DEFAULT_AUTOH_OFF_VALVE_LEVEL), lambda v: cfg.set("AUTOH", "OFF_VALVE_LEVEL", v)),
-            FloatField("On Temp <", cfg.get("AUTOH", "ON_TEMP", DEFAULT_AUTOH_ON_TEMP), lambda v: cfg.set("AUTOH", "ON_TEMP", v)),
-            FloatField("On Valve >", cfg.get("AUTOH", "ON_VALVE_LEVEL", DEFAULT_AUTOH_ON_VALVE_LEVEL), lambda v: cfg.set("AUTOH", "ON_VALVE_LEVEL", v)),
+            BoolField("Enable Auto", cfg.get("AUTOH", "ENABLE"), lambda v: cfg.set("AUTOH", "ENABLE", v)),
+            FloatField("Off Temp >=", cfg.get("AUTOH", "OFF_TEMP"), lambda v: cfg.set("AUTOH", "OFF_TEMP", v)),
+            FloatField("Off Valve <", cfg.get("AUTOH", "OFF_VALVE_LEVEL"), lambda v: cfg.set("AUTOH", "OFF_VALVE_LEVEL", v)),
+            FloatField("On Temp <", cfg.get("AUTOH", "ON_TEMP"), lambda v: cfg.set("AUTOH", "ON_TEMP", v)),
+            FloatField("On Valve >", cfg.get("AUTOH", "ON_VALVE_LEVEL"), lambda v: cfg.set("AUTOH", "ON_VALVE_LEVEL", v)),
         ]),
         Menu("PID", [
             Action("Reset PID state", pid.reset),
-            FloatField("Prop. Gain (Kp)", cfg.get("PID", "KP", DEFAULT_PID_KP), 
+            FloatField("Prop. Gain (Kp)", cfg.get("PID", "KP"), 
                        lambda v: cfg.set("PID", "KP", v), 
                        precision=5), 
-            FloatField("Integ. Gain (Ki)", cfg.get("PID", "KI", DEFAULT_PID_KI), 
+            FloatField("Integ. Gain (Ki)", cfg.get("PID", "KI"), 
                        lambda v: cfg.set("PID", "KI", v), 
                        precision=5),
-            FloatField("Deriv. Gain (Kd)", cfg.get("PID", "KD", DEFAULT_PID_KD), 
+            FloatField("Deriv. Gain (Kd)", cfg.get("PID", "KD"), 
                        lambda v: cfg.set("PID", "KD", v), 
                        precision=5),
-            FloatField("Integral Range", cfg.get("PID", "INTEGRAL_ACCUMULATION_RANGE", DEFAULT_PID_INTEGRAL_ACCUMULATION_RANGE), 
+            FloatField("Integral Range", cfg.get("PID", "INTEGRAL_ACCUMULATION_RANGE"), 
                        lambda v: cfg.set("PID", "INTEGRAL_ACCUMULATION_RANGE", v),
                        precision=2),
-            FloatField("Setpoint (Valve%)", cfg.get("PID", "SETPOINT", DEFAULT_PID_SETPOINT), 
+            FloatField("Setpoint (Valve%)", cfg.get("PID", "SETPOINT"), 
                        lambda v: cfg.set("PID", "SETPOINT", v)),
-            FloatField("Valve Min %", cfg.get("PID", "VALVE_MIN", DEFAULT_PID_VALVE_MIN), 
+            FloatField("Valve Min %", cfg.get("PID", "VALVE_MIN"), 
                        lambda v: cfg.set("PID", "VALVE_MIN", v)),
-            FloatField("Valve Max %", cfg.get("PID", "VALVE_MAX", DEFAULT_PID_VALVE_MAX), 
+            FloatField("Valve Max %", cfg.get("PID", "VALVE_MAX"), 
                        lambda v: cfg.set("PID", "VALVE_MAX", v)),
-            FloatField("Output Deadband", cfg.get("PID", "OUTPUT_DEADBAND", DEFAULT_PID_OUTPUT_DEADBAND), 
+            FloatField("Output Deadband", cfg.get("PID", "OUTPUT_DEADBAND"), 
                        lambda v: cfg.set("PID", "OUTPUT_DEADBAND", v)),
         ]),
         Menu("Feedforward", [
-            FloatField("Wind Coeff", cfg.get("FEEDFORWARD", "WIND_COEFF", DEFAULT_PID_FF_WIND_COEFF), 
+            FloatField("Wind Coeff", cfg.get("FEEDFORWARD", "WIND_COEFF"), 
                        lambda v: cfg.set("FEEDFORWARD", "WIND_COEFF", v)),
-            FloatField("Temp Coeff", cfg.get("FEEDFORWARD", "TEMP_COEFF", DEFAULT_PID_FF_TEMP_COEFF), 
+            FloatField("Temp Coeff", cfg.get("FEEDFORWARD", "TEMP_COEFF"), 
                        lambda v: cfg.set("FEEDFORWARD", "TEMP_COEFF", v)),
-            FloatField("Sun Coeff", cfg.get("FEEDFORWARD", "SUN_COEFF", DEFAULT_PID_FF_SUN_COEFF), 
+            FloatField("Sun Coeff", cfg.get("FEEDFORWARD", "SUN_COEFF"), 
                        lambda v: cfg.set("FEEDFORWARD", "SUN_COEFF", v)),
-            FloatField("Wind Interact", cfg.get("FEEDFORWARD", "WIND_CHILL_COEFF", DEFAULT_PID_FF_WIND_CHILL_COEFF), 
+            FloatField("Wind Interact", cfg.get("FEEDFORWARD", "WIND_CHILL_COEFF"), 
                        lambda v: cfg.set("FEEDFORWARD", "WIND_CHILL_COEFF", v), 
                        precision=4),
-            FloatField("Base Temp Outside", cfg.get("FEEDFORWARD", "BASE_TEMP_REF_OUTSIDE", DEFAULT_PID_BASE_TEMP_REF_OUTSIDE), 
+            FloatField("Base Temp Outside", cfg.get("FEEDFORWARD", "BASE_TEMP_REF_OUTSIDE"), 
                        lambda v: cfg.set("FEEDFORWARD", "BASE_TEMP_REF_OUTSIDE", v)),
-            FloatField("Base Temp Boiler", cfg.get("FEEDFORWARD", "BASE_TEMP_BOILER", DEFAULT_PID_BASE_TEMP_BOILER), 
+            FloatField("Base Temp Boiler", cfg.get("FEEDFORWARD", "BASE_TEMP_BOILER"), 
                        lambda v: cfg.set("FEEDFORWARD", "BASE_TEMP_BOILER", v)),
         ]),
         Menu("Device", [
@@ -209,17 +206,20 @@ def initialize_services(cfg):
     logger.info("Initialising services...")
     
     # --- Instantiate Core Services ---
+    # Both share state_evt so the connectivity task wakes on either a WiFi or a CCU transition
     wifi = WiFiManager(
         cfg.get("WIFI", "SSID"), 
         cfg.get("WIFI", "PASS"), 
-        unique_hardware_name()[:15]
+        unique_hardware_name()[:15],
+        state_event=state_evt
     )
     hm = HomematicDataService(
         f"http://{cfg.get('CCU3', 'IP')}/api/homematic.cgi",
         cfg.get("CCU3", "USER"), 
         cfg.get("CCU3", "PASS"), 
         cfg.get("CCU3", "VALVE_DEVTYPE", "HmIP-eTRV"),
-        weather_device_type=str(cfg.get("CCU3", "WEATHER_DEVTYPE", "HmIP-SWO"))
+        weather_device_type=str(cfg.get("CCU3", "WEATHER_DEVTYPE", "HmIP-SWO")),
+        state_event=state_evt
     )
     
     # --- Instantiate OpenTherm Manager ---
@@ -236,29 +236,29 @@ def initialize_services(cfg):
     # --- Instantiate PID Controller ---
     logger.info("Instantiating PID Controller...")
     pid = PIDController(
-        kp=cfg.get("PID", "KP", DEFAULT_PID_KP), 
-        ki=cfg.get("PID", "KI", DEFAULT_PID_KI),
-        kd=cfg.get("PID", "KD", DEFAULT_PID_KD),
-        setpoint=cfg.get("PID", "SETPOINT", DEFAULT_PID_SETPOINT),
-        output_min=cfg.get("PID", "MIN_HEATING_SETPOINT", DEFAULT_PID_MIN_HEATING_SETPOINT),
-        output_max=cfg.get("OT", "MAX_HEATING_SETPOINT", DEFAULT_OT_MAX_HEATING_SETPOINT),
-        integral_accumulation_range=cfg.get("PID", "INTEGRAL_ACCUMULATION_RANGE", DEFAULT_PID_INTEGRAL_ACCUMULATION_RANGE),
-        valve_input_min=cfg.get("PID", "VALVE_MIN", DEFAULT_PID_VALVE_MIN),
-        valve_input_max=cfg.get("PID", "VALVE_MAX", DEFAULT_PID_VALVE_MAX),
+        kp=cfg.get("PID", "KP"), 
+        ki=cfg.get("PID", "KI"),
+        kd=cfg.get("PID", "KD"),
+        setpoint=cfg.get("PID", "SETPOINT"),
+        output_min=cfg.get("PID", "MIN_HEATING_SETPOINT"),
+        output_max=cfg.get("OT", "MAX_HEATING_SETPOINT"),
+        integral_accumulation_range=cfg.get("PID", "INTEGRAL_ACCUMULATION_RANGE"),
+        valve_input_min=cfg.get("PID", "VALVE_MIN"),
+        valve_input_max=cfg.get("PID", "VALVE_MAX"),
         time_factor=1.0,
-        output_deadband=cfg.get("PID", "OUTPUT_DEADBAND", DEFAULT_PID_OUTPUT_DEADBAND)
+        output_deadband=cfg.get("PID", "OUTPUT_DEADBAND")
     )
     logger.info("PID Controller instantiated.")
 
     # --- Instantiate Feedforward Controller ---
     logger.info("Instantiating Feedforward Controller...")
     feedforward = FeedforwardController(
-        wind_coeff=cfg.get("FEEDFORWARD", "WIND_COEFF", DEFAULT_PID_FF_WIND_COEFF),
-        temp_coeff=cfg.get("FEEDFORWARD", "TEMP_COEFF", DEFAULT_PID_FF_TEMP_COEFF),
-        sun_coeff=cfg.get("FEEDFORWARD", "SUN_COEFF", DEFAULT_PID_FF_SUN_COEFF),
-        wind_chill_coeff=cfg.get("FEEDFORWARD", "WIND_CHILL_COEFF", DEFAULT_PID_FF_WIND_CHILL_COEFF),
-        base_temp_ref_outside=cfg.get("FEEDFORWARD", "BASE_TEMP_REF_OUTSIDE", DEFAULT_PID_BASE_TEMP_REF_OUTSIDE),
-        base_temp_boiler=cfg.get("FEEDFORWARD", "BASE_TEMP_BOILER", DEFAULT_PID_BASE_TEMP_BOILER)
+        wind_coeff=cfg.get("FEEDFORWARD", "WIND_COEFF"),
+        temp_coeff=cfg.get("FEEDFORWARD", "TEMP_COEFF"),
+        sun_coeff=cfg.get("FEEDFORWARD", "SUN_COEFF"),
+        wind_chill_coeff=cfg.get("FEEDFORWARD", "WIND_CHILL_COEFF"),
+        base_temp_ref_outside=cfg.get("FEEDFORWARD", "BASE_TEMP_REF_OUTSIDE"),
+        base_temp_boiler=cfg.get("FEEDFORWARD", "BASE_TEMP_BOILER")
     )
     logger.info("Feedforward Controller instantiated.")
 
@@ -266,8 +266,8 @@ def initialize_services(cfg):
     logger.info("Instantiating Heating Controller...")
     heating_controller = HeatingController(
         cfg,
-        cfg.get("PID", "MIN_HEATING_SETPOINT", DEFAULT_PID_MIN_HEATING_SETPOINT),
-        cfg.get("OT", "MAX_HEATING_SETPOINT", DEFAULT_OT_MAX_HEATING_SETPOINT),
+        cfg.get("PID", "MIN_HEATING_SETPOINT"),
+        cfg.get("OT", "MAX_HEATING_SETPOINT"),
         hm, 
         opentherm, 
         pid, 
@@ -1,5 +1,6 @@
 # button_controller.py - Handles button input via any Pin-compatible interface.
 import utime
+from uasyncio import ThreadSafeFlag
 
 class ButtonEventType:
     PRESSED = 0
@@ -31,8 +32,9 @@ class HIDController:
     PRESSED = 1
     LONG_PRESSED = 2
 
-    def __init__(self, button_left_pin, button_up_pin, button_down_pin, button_right_pin, button_select_pin):
-        """Initialize with Pin-compatible objects for each button."""
+    def __init__(self, button_left_pin, button_up_pin, button_down_pin, button_right_pin, button_select_pin, irq_pin=None):
+        """Initialize with Pin-compatible objects for each button.
+        irq_pin: optional machine.Pin wired to a port expander's INT output, used instead of per-button IRQs."""
         self.buttons = {
             ButtonName.LEFT: button_left_pin,
             ButtonName.UP: button_up_pin,
@@ -54,6 +56,38 @@ class HIDController:
         # Observer pattern
         self.observers = []
 
+        # Edge interrupts wake the polling task; stays None if no IRQ source is available
+        self._flag = ThreadSafeFlag()
+        if irq_pin is not None:
+            # Expander INT is active low and stays asserted until the port is read by get_event()
+            irq_pin.irq(handler=self._on_edge, trigger=irq_pin.IRQ_FALLING)
+            return
+        try:
+            for pin in self.buttons.values():
+                pin.irq(handler=self._on_edge, trigger=pin.IRQ_FALLING | pin.IRQ_RISING)
+        except AttributeError: # McpPin without INT_PIN wiring
+            for pin in self.buttons.values():
+                if hasattr(pin, 'irq'):
+                    pin.irq(handler=None)
+            self._flag = None
+
+    def _on_edge(self, pin):
+        """IRQ handler: wake the button task."""
+        self._flag.set()
+
+    def has_irq(self):
+        """True if button edges raise an interrupt, so wait_edge() can be used instead of polling."""
+        return self._flag is not None
+
+    async def wait_edge(self):
+        """Suspends until the next button edge interrupt. Only valid when has_irq() is True."""
+        await self._flag.wait()
+
+    def is_idle(self):
+        """True when no button is held and the debounce window has elapsed."""
+        return self.active_button is None and \
+            utime.ticks_diff(utime.ticks_ms(), self.last_press_time) > self.debounce_delay
+
     def add_observer(self, observer):
         """Add an observer to receive button events."""
         if observer not in self.observers:
@@ -204,7 +204,7 @@ class DisplayController:
     #         char_index = 6
 
     #     # Update character 2 with the selected pattern
-    #     self.lcd.define_custom_char(2, DYNAMIC_CUSTOM_CHARS[char_index])
+    #     self.lcd.define_custom_char(2, glyph(DYNAMIC_GLYPH_BASE + char_index))
 
     #     # Display the status character
     #     self.lcd.set_cursor(self.cols - 1, row)
@@ -221,7 +221,7 @@ class DisplayController:
         self.lcd.show_cursor(show)
 
     def load_custom_chars(self, custom_chars):
-        """Loads all defined custom characters from CUSTOM_CHARS list into CGRAM."""
+        """Loads up to 8 patterns (e.g. glyphs.glyph(CUSTOM_GLYPH_BASE + i)) into CGRAM slots 0-7."""
         logger.info("Loading custom characters to CGRAM...")
         # Ensure we don't try to load more than 8
         num_chars_to_load = min(len(custom_chars), 8)
@@ -74,7 +74,7 @@ class FeedforwardController:
             # Combine all effects
             ff_output = self.base_temp_boiler + temp_compensation + wind_effect + sun_compensation
             
-            logger.debug(f"FF Calc: Temp={temp_diff:.2f}, Wind={wind_effect:.2f}, Sun={sun_compensation:.2f}")
+            logger.debug("FF Calc: Temp=%.2f, Wind=%.2f, Sun=%.2f", temp_diff, wind_effect, sun_compensation)
             return ff_output
             
         except (ValueError, TypeError) as e:
@@ -84,35 +84,35 @@ class FeedforwardController:
     def set_wind_coeff(self, coeff):
         """Sets the feed-forward coefficient for wind speed."""
         if abs(self.wind_coeff - coeff) > _FLOAT_TOLERANCE:
-            logger.info(f"FF wind_coeff updated from {self.wind_coeff} to: {coeff}")
+            logger.info("FF wind_coeff updated from %s to: %s", self.wind_coeff, coeff)
             self.wind_coeff = coeff
 
     def set_temp_coeff(self, coeff):
         """Sets the feed-forward coefficient for outside temperature."""
         if abs(self.temp_coeff - coeff) > _FLOAT_TOLERANCE:
-            logger.info(f"FF temp_coeff updated from {self.temp_coeff} to: {coeff}")
+            logger.info("FF temp_coeff updated from %s to: %s", self.temp_coeff, coeff)
             self.temp_coeff = coeff
 
     def set_sun_coeff(self, coeff):
         """Sets the feed-forward coefficient for sun illumination."""
         if abs(self.sun_coeff - coeff) > _FLOAT_TOLERANCE:
-            logger.info(f"FF sun_coeff updated from {self.sun_coeff} to: {coeff}")
+            logger.info("FF sun_coeff updated from %s to: %s", self.sun_coeff, coeff)
             self.sun_coeff = coeff
 
     def set_wind_chill_coeff(self, coeff):
         """Sets the wind chill interaction coefficient."""
         if abs(self.wind_chill_coeff - coeff) > _FLOAT_TOLERANCE:
-            logger.info(f"FF wind_chill_coeff updated from {self.wind_chill_coeff} to: {coeff}")
+            logger.info("FF wind_chill_coeff updated from %s to: %s", self.wind_chill_coeff, coeff)
             self.wind_chill_coeff = coeff
 
     def set_base_temp_ref_outside(self, temp):
         """Sets the reference outside temperature."""
         if abs(self.base_temp_ref_outside - temp) > _FLOAT_TOLERANCE:
-            logger.info(f"FF base_temp_ref_outside updated from {self.base_temp_ref_outside} to: {temp}")
+            logger.info("FF base_temp_ref_outside updated from %s to: %s", self.base_temp_ref_outside, temp)
             self.base_temp_ref_outside = temp
 
     def set_base_temp_boiler(self, temp):
         """Sets the base boiler temperature."""
         if abs(self.base_temp_boiler - temp) > _FLOAT_TOLERANCE:
-            logger.info(f"FF base_temp_boiler updated from {self.base_temp_boiler} to: {temp}")
+            logger.info("FF base_temp_boiler updated from %s to: %s", self.base_temp_boiler, temp)
             self.base_temp_boiler = temp 
\ No newline at end of file
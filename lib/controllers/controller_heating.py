@@ -6,11 +6,58 @@ the logic for controlling heating based on various modes (auto, manual)
 and conditions (temperature, valve openings).
 """
 
+import uasyncio as asyncio
 from managers.manager_logger import Logger
 from controllers.controller_feedforward import FeedforwardController
-from platform_spec import DEFAULT_OT_SETPOINT_TOLERANCE, DEFAULT_OT_OFF_SETPOINT  #todo: move this to some initialization
+from managers.manager_otgw import CMD_STATUS_PENDING
 logger = Logger()
 
+# Settings read in a control cycle, grouped by section; keys are unique across sections
+# Defaults come from the ConfigManager defaults table (factory config)
+_CFG_KEYS = (
+    ("OT", ("ENABLE_CONTROLLER", "ENABLE_HEATING", "ENABLE_DHW", "ENFORCE_DHW_SETPOINT", "DHW_SETPOINT",
+            "MAX_HEATING_SETPOINT", "MANUAL_HEATING_SETPOINT", "OFF_SETPOINT", "SETPOINT_TOLERANCE")),
+    ("AUTOH", ("ENABLE", "OFF_TEMP", "OFF_VALVE_LEVEL", "ON_TEMP", "ON_VALVE_LEVEL")),
+    ("PID", ("KP", "KI", "KD", "SETPOINT", "MIN_HEATING_SETPOINT", "VALVE_MIN", "VALVE_MAX",
+             "OUTPUT_DEADBAND", "INTEGRAL_ACCUMULATION_RANGE")),
+    ("FEEDFORWARD", ("WIND_COEFF", "TEMP_COEFF", "SUN_COEFF", "WIND_CHILL_COEFF",
+                     "BASE_TEMP_REF_OUTSIDE", "BASE_TEMP_BOILER")),
+)
+
+# (config key, setter name) pairs pushed to the PID and feedforward controllers each cycle
+_PID_LIMIT_SPEC = (
+    ("MAX_HEATING_SETPOINT", "set_output_max"),
+    ("MIN_HEATING_SETPOINT", "set_output_min"),
+)
+_PID_PARAM_SPEC = (
+    ("KP", "set_kp"),
+    ("KI", "set_ki"),
+    ("KD", "set_kd"),
+    ("SETPOINT", "set_setpoint"),
+    ("VALVE_MIN", "set_valve_input_min"),
+    ("VALVE_MAX", "set_valve_input_max"),
+    ("OUTPUT_DEADBAND", "set_output_deadband"),
+    ("INTEGRAL_ACCUMULATION_RANGE", "set_integral_accumulation_range"),
+)
+_FF_PARAM_SPEC = (
+    ("WIND_COEFF", "set_wind_coeff"),
+    ("TEMP_COEFF", "set_temp_coeff"),
+    ("SUN_COEFF", "set_sun_coeff"),
+    ("WIND_CHILL_COEFF", "set_wind_chill_coeff"),
+    ("BASE_TEMP_REF_OUTSIDE", "set_base_temp_ref_outside"),
+    ("BASE_TEMP_BOILER", "set_base_temp_boiler"),
+)
+
+def _bind_setters(obj, spec):
+    """Resolves the setter names in spec on obj once, returning (key, bound method) pairs."""
+    if obj is None:
+        return ()
+    return tuple((key, getattr(obj, name)) for key, name in spec)
+
+def _changed(desired, actual, tol_tenths):
+    """True if actual is unknown or differs from desired by more than tol_tenths, compared in integer tenths."""
+    return actual is None or abs(round(desired * 10) - round(actual * 10)) > tol_tenths
+
 class HeatingController:
     """
     HeatingController manages central heating decisions based on configured
@@ -34,225 +81,288 @@ class HeatingController:
         self._feedforward = feedforward_controller
         self._output_min = output_min
         self._output_max = output_max
-        # State flags
-        self._force_on_next_cycle = False
-        self._force_off_next_cycle = False
+        # Bound setters, resolved once instead of on every cycle
+        self._pid_limit_setters = _bind_setters(pid_controller, _PID_LIMIT_SPEC)
+        self._pid_param_setters = _bind_setters(pid_controller, _PID_PARAM_SPEC)
+        self._ff_param_setters = _bind_setters(feedforward_controller, _FF_PARAM_SPEC)
+        # One-shot override for the next auto cycle: None, True (force ON) or False (force OFF)
+        self._override = None
+        # Values launched per OT command code ("CH", "CS", "HW", "SW"), kept while the command is in flight
+        self._applied = {}
+        # Config snapshot and the ConfigManager version it was taken at
+        self._cfg = None
+        self._cfg_version = -1
+        # (OFF_TEMP, OFF_VALVE_LEVEL, ON_TEMP, ON_VALVE_LEVEL), refreshed with the snapshot
+        self._autoh_limits = None
+        # SETPOINT_TOLERANCE in integer tenths of a degree, refreshed with the snapshot
+        self._tol_tenths = 1
+        # Homematic inputs of the previous cycle, see update()
+        self._last_inputs = None
+        # Wakes the control task early, e.g. after a config change from the GUI
+        self._poke = asyncio.ThreadSafeFlag()
+        config_manager.subscribe("*", self._on_config_change)
+
+    def _on_config_change(self, value):
+        """Config listener: run the next cycle without waiting for the interval."""
+        self.poke()
+
+    def poke(self):
+        """Requests an immediate control cycle."""
+        self._poke.set()
+
+    async def wait_poke(self, timeout_ms):
+        """Sleeps up to timeout_ms. Returns True if poke() ended the wait early."""
+        try:
+            await asyncio.wait_for_ms(self._poke.wait(), timeout_ms)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     def trigger_heating_on(self):
         """Sets the flag to force heating ON in the next cycle."""
-        self._force_on_next_cycle = True
+        self._override = True
         logger.info("ACTION: Triggered Heating ON for next cycle.")
+        self.poke()  # Act now rather than at the next interval
     
     def trigger_heating_off(self):
         """Sets the flag to force heating OFF in the next cycle."""
-        self._force_off_next_cycle = True
+        self._override = False
         logger.info("ACTION: Triggered Heating OFF for next cycle.")
+        self.poke()
+
+    def _shadow(self, cmd_code, reported):
+        """Returns the value applied with cmd_code while that command is still in flight, else the boiler-reported value.
+        Once the command completes, the reported value is authoritative again, so later changes made by the
+        gateway or another client are still detected and corrected."""
+        value = self._applied.get(cmd_code)
+        if value is not None:
+            state = self._ot.get_command_status(cmd_code)
+            if state is None or state.status == CMD_STATUS_PENDING: # Queued in this batch or awaiting the OTGW
+                return value
+            del self._applied[cmd_code]  # Completed or failed: trust what the boiler reports
+        return reported
 
-    async def _sync_ot_takeover(self):
+    def _apply(self, cmd_code, value, setter, *args):
+        """Launches setter(*args) and remembers value as applied for cmd_code if the command was accepted."""
+        if setter(*args):
+            self._applied[cmd_code] = value
+
+    def _sync_ot_takeover(self, cfg, actual_takeover):
         """Ensures OTGW controller takeover state matches configuration."""
-        desired_takeover = self._config.get("OT", "ENABLE_CONTROLLER")
-        actual_takeover = self._ot.is_active()
+        desired_takeover = cfg["ENABLE_CONTROLLER"]
 
         if desired_takeover and not actual_takeover:
             logger.info("SYNC: Takeover ON desired, not active. Taking control.")
+            self._applied.clear()
             self._ot.take_control()
         elif not desired_takeover and actual_takeover:
             logger.info("SYNC: Takeover OFF desired, but active. Relinquishing control.")
+            self._applied.clear()
             self._ot.relinquish_control()
 
-    async def _sync_dhw_control(self):
+    def _sync_dhw_control(self, cfg, actual_dhw_state, actual_dhw_sp):
         """Synchronizes DHW enable state and setpoint based on configuration."""
         # Always manage DHW enable/disable based on its specific config toggle
-        dhw_enabled = self._config.get("OT", "ENABLE_DHW")
-        actual_dhw_state = self._ot.is_dhw_enabled()
+        dhw_enabled = cfg["ENABLE_DHW"]
         if dhw_enabled != actual_dhw_state:
-            logger.info(f"SYNC: Setting DHW enable from {actual_dhw_state} to {dhw_enabled}")
-            self._ot.set_hot_water_mode(1 if dhw_enabled else 0)
+            logger.info("SYNC: Setting DHW enable from %s to %s", actual_dhw_state, dhw_enabled)
+            self._apply("HW", dhw_enabled, self._ot.set_hot_water_mode, 1 if dhw_enabled else 0)
         
         # Sync DHW setpoint ONLY if DHW is enabled AND the enforce flag is set
-        if dhw_enabled and self._config.get("OT", "ENFORCE_DHW_SETPOINT"):
-            desired_dhw_sp = self._config.get("OT", "DHW_SETPOINT")
-            actual_dhw_sp = self._ot.get_dhw_setpoint()
-            tolerance = self._config.get("OT", "SETPOINT_TOLERANCE",DEFAULT_OT_SETPOINT_TOLERANCE)
-            if abs(desired_dhw_sp - actual_dhw_sp) > tolerance:
-                logger.info(f"SYNC (Enforced): Setting DHW Setpoint from {actual_dhw_sp} to {desired_dhw_sp}")
-                self._ot.set_dhw_setpoint(desired_dhw_sp)
-
-    async def _sync_pid_limits(self):
-        """Updates the PID controller's output limits based on configuration."""
-        if not self._pid:
-            return
-
-        desired_max_ch_sp = self._config.get("OT", "MAX_HEATING_SETPOINT")
-        self._pid.set_output_max(desired_max_ch_sp)
+        if dhw_enabled and cfg["ENFORCE_DHW_SETPOINT"]:
+            desired_dhw_sp = cfg["DHW_SETPOINT"]
+            if _changed(desired_dhw_sp, actual_dhw_sp, self._tol_tenths):
+                logger.info("SYNC (Enforced): Setting DHW Setpoint from %s to %s", actual_dhw_sp, desired_dhw_sp)
+                self._apply("SW", desired_dhw_sp, self._ot.set_dhw_setpoint, desired_dhw_sp)
 
-        cfg_output_min = self._config.get("PID", "MIN_HEATING_SETPOINT")
-        self._pid.set_output_min(cfg_output_min)
+    def _sync_pid_limits(self, cfg):
+        """Updates the PID controller's output limits based on configuration."""
+        for key, setter in self._pid_limit_setters:
+            setter(cfg[key])
 
-    async def _sync_pid_params(self):
+    def _sync_pid_params(self, cfg):
         """Synchronizes PID parameters from config to the PID instance."""
-        if not self._pid:
-            return
-
-        self._pid.set_kp(self._config.get("PID", "KP"))
-        self._pid.set_ki(self._config.get("PID", "KI"))
-        self._pid.set_kd(self._config.get("PID", "KD"))
-        self._pid.set_setpoint(self._config.get("PID", "SETPOINT"))
-        self._pid.set_valve_input_min(self._config.get("PID", "VALVE_MIN"))
-        self._pid.set_valve_input_max(self._config.get("PID", "VALVE_MAX"))
-        self._pid.set_output_deadband(self._config.get("PID", "OUTPUT_DEADBAND"))
-        self._pid.set_integral_accumulation_range(self._config.get("PID", "INTEGRAL_ACCUMULATION_RANGE"))
+        for key, setter in self._pid_param_setters:
+            setter(cfg[key])
 
-    async def _sync_feedforward_params(self):
+    def _sync_feedforward_params(self, cfg):
         """Synchronizes feedforward parameters from config."""
-        self._feedforward.set_wind_coeff(self._config.get("FEEDFORWARD", "WIND_COEFF"))
-        self._feedforward.set_temp_coeff(self._config.get("FEEDFORWARD", "TEMP_COEFF"))
-        self._feedforward.set_sun_coeff(self._config.get("FEEDFORWARD", "SUN_COEFF"))
-        self._feedforward.set_wind_chill_coeff(self._config.get("FEEDFORWARD", "WIND_CHILL_COEFF"))
-        self._feedforward.set_base_temp_ref_outside(self._config.get("FEEDFORWARD", "BASE_TEMP_REF_OUTSIDE"))
-        self._feedforward.set_base_temp_boiler(self._config.get("FEEDFORWARD", "BASE_TEMP_BOILER"))
+        for key, setter in self._ff_param_setters:
+            setter(cfg[key])
     
+    def _read_config(self):
+        """Returns a snapshot of all settings used in one control cycle, keyed by key name."""
+        config = self._config
+        cfg = {}
+        for section, keys in _CFG_KEYS:
+            values = config.get_section(section)  # One lookup per section
+            for key in keys:
+                value = values.get(key)
+                # Missing keys go through get() so the default is filled in and saved
+                cfg[key] = value if value is not None else config.get(section, key)
+        config.save_config() # Persist any defaults filled in above, in one write
+        return cfg
+
     async def update(self):
         """
         Main update method that handles heating control logic.
         Determines the heating state and setpoint based on mode and conditions.
         Applies the state and setpoint to the OpenTherm manager.
+
+        Returns:
+            bool: True if any OT command was sent or the Homematic inputs changed this cycle
         """
-        # Sync basic states regardless of takeover
-        await self._sync_ot_takeover()
-        await self._sync_dhw_control()
-        await self._sync_pid_limits()
-        await self._sync_pid_params()
-        await self._sync_feedforward_params()
+        version = self._config.version
+        params_changed = version != self._cfg_version
+        if params_changed:
+            cfg = self._cfg = self._read_config()
+            self._autoh_limits = (cfg["OFF_TEMP"], cfg["OFF_VALVE_LEVEL"], cfg["ON_TEMP"], cfg["ON_VALVE_LEVEL"])
+            self._tol_tenths = round(cfg["SETPOINT_TOLERANCE"] * 10)
+            self._cfg_version = self._config.version # get() may have filled in missing defaults
+        cfg = self._cfg
+        # Sensor readings, fetched together once per cycle; a change counts as activity for the task's backoff
+        inputs = self._hm.snapshot()
+        inputs_changed = inputs != self._last_inputs
+        self._last_inputs = inputs
+        # Queue OT commands for this cycle and send them together
+        self._ot.begin_batch()
+        try:
+            await self._update(cfg, params_changed, inputs)
+        except Exception:
+            self._cfg_version = -1 # Re-read and re-push everything next cycle
+            raise
+        finally:
+            sent = self._ot.commit()
+        return sent > 0 or inputs_changed
+
+    async def _update(self, cfg, params_changed, inputs):
+        """Runs one control cycle with the given config snapshot and Homematic inputs.
+        PID and feedforward parameters are only pushed when params_changed is set."""
+        # Boiler/OT state, read once per cycle and passed down
+        ot = self._ot
+        st = ot.snapshot()
+        active = st.active
+        ch_on = self._shadow("CH", st.ch_enabled)
+        cs = self._shadow("CS", st.control_sp)
+
+        # Sync basic states regardless of takeover, yielding between steps so button/LED tasks stay responsive
+        self._sync_ot_takeover(cfg, active)
+        await asyncio.sleep(0)
+        self._sync_dhw_control(cfg, self._shadow("HW", st.dhw_enabled), self._shadow("SW", st.dhw_sp))
+        await asyncio.sleep(0)
+        if params_changed:
+            # These depend on config only, so an unchanged config means nothing to push
+            self._sync_pid_limits(cfg)
+            self._sync_pid_params(cfg)
+            self._sync_feedforward_params(cfg)
+            await asyncio.sleep(0)
 
         # Only perform heating control if OT manager has control
-        if not self._ot.is_active():
+        if not active:
             logger.debug("Takeover OFF: Skipping heating control actions.")
             return
 
         # Check boiler connection before proceeding
-        if not self._ot.is_boiler_connected():
+        if not ot.is_boiler_connected():
             logger.debug("Boiler not connected: Skipping heating control actions.")
+            self._applied.clear()  # Boiler state is unknown after a reconnect
             return
             
         # Determine mode
-        auto_heat_enabled = self._config.get("AUTOH", "ENABLE")
+        auto_heat_enabled = cfg["ENABLE"]
         
         # Get target state and setpoint based on mode
         if auto_heat_enabled:
-            target_heating_state, target_setpoint = self._handle_auto_heating()
+            target_heating_state, target_setpoint = self._handle_auto_heating(cfg, ch_on, inputs)
         else:
-            target_heating_state, target_setpoint = self._handle_manual_heating()
+            target_heating_state, target_setpoint = self._handle_manual_heating(cfg)
 
         # Apply the determined heating state
-        actual_heating_state = self._ot.is_ch_enabled()
-        if target_heating_state != actual_heating_state:
-            logger.info(f"State Change: Setting CH from {actual_heating_state} to {target_heating_state}")
+        if target_heating_state != ch_on:
+            logger.info("State Change: Setting CH from %s to %s", ch_on, target_heating_state)
             # Reset PID state on any heating state transition
             if self._pid:
                 logger.info("Heating state changing: Resetting PID state")
                 self._pid.reset()
-            self._ot.set_central_heating(target_heating_state)
+            self._apply("CH", target_heating_state, ot.set_central_heating, target_heating_state)
         
         # Apply the determined control setpoint
+        if cs is None:
+            logger.debug("Boiler not ready. Control setpoint from boiler is None: Skipping heating control actions.")
+            return
         if target_heating_state:
-            actual_control_setpoint = self._ot.get_control_setpoint()
-            if actual_control_setpoint is None:
-                logger.debug("Boiler not ready. Control setpoint from boiler is None: Skipping heating control actions.")
-                return
-            tolerance = self._config.get("OT", "SETPOINT_TOLERANCE",DEFAULT_OT_SETPOINT_TOLERANCE)
-            if abs(target_setpoint - actual_control_setpoint) > tolerance:
-                logger.info(f"Applying Control Setpoint: {target_setpoint:.2f} (Previous: {actual_control_setpoint})")
-                self._ot.set_control_setpoint(target_setpoint)
+            if _changed(target_setpoint, cs, self._tol_tenths):
+                logger.info("Applying Control Setpoint: %.2f (Previous: %s)", target_setpoint, cs)
+                self._apply("CS", target_setpoint, ot.set_control_setpoint, target_setpoint)
             else:
-                logger.debug(f"Control Setpoint unchanged: {target_setpoint:.2f}")
+                logger.debug("Control Setpoint unchanged: %.2f", target_setpoint)
         else:  # Heating is OFF, ensure control setpoint is low
-            actual_control_setpoint = self._ot.get_control_setpoint()
-            if actual_control_setpoint is None:
-                logger.debug("Boiler not ready. Control setpoint from boiler is None: Skipping heating control actions.")
-                return
-            default_off_sp = self._config.get("OT", "OFF_SETPOINT", DEFAULT_OT_OFF_SETPOINT)
-            tolerance = self._config.get("OT", "SETPOINT_TOLERANCE", DEFAULT_OT_SETPOINT_TOLERANCE)
-            if abs(actual_control_setpoint - default_off_sp) > tolerance:
-                logger.info(f"Heating OFF, ensuring Control Setpoint is {default_off_sp} (was {actual_control_setpoint})")
-                self._ot.set_control_setpoint(default_off_sp)
+            default_off_sp = cfg["OFF_SETPOINT"]
+            if _changed(default_off_sp, cs, self._tol_tenths):
+                logger.info("Heating OFF, ensuring Control Setpoint is %s (was %s)", default_off_sp, cs)
+                self._apply("CS", default_off_sp, ot.set_control_setpoint, default_off_sp)
     
-    def _check_override_flags(self):
-        """Check and handle any override flags.
-        
-        Returns:
-            tuple: (target_heating_state, override_active)
-        """
-        if self._force_on_next_cycle:
-            logger.info("AutoHeat OVERRIDE: Forcing heating ON this cycle.")
-            self._force_on_next_cycle = False  # Consume the flag
-            return True, True
-        elif self._force_off_next_cycle:
-            logger.info("AutoHeat OVERRIDE: Forcing heating OFF this cycle.")
-            self._force_off_next_cycle = False  # Consume the flag
-            return False, True
-        return None, False
-
-    def _should_disable_heating(self, current_temp, avg_level):
-        """Check if heating should be disabled based on temperature and valve levels.
-        
-        Args:
-            current_temp: Current temperature reading
-            avg_level: Average valve level
-            
+    def _take_override(self):
+        """Consumes the pending override.
+
         Returns:
-            bool: True if heating should be disabled
+            bool | None: True/False to force heating ON/OFF this cycle, None if no override is pending
         """
-        # Reload config values each time to ensure we have the latest
-        off_temp = self._config.get("AUTOH", "OFF_TEMP")
-        off_valve = self._config.get("AUTOH", "OFF_VALVE_LEVEL")
+        override = self._override
+        if override is not None:
+            self._override = None
+            logger.info("AutoHeat OVERRIDE: Forcing heating %s this cycle.", "ON" if override else "OFF")
+        return override
 
-        if (current_temp is not None and (current_temp >= off_temp)) or (avg_level is not None and (avg_level < off_valve)):
-            logger.info(f"AutoHeat: Condition met to disable heating (Temp {current_temp:.1f}C >= {off_temp:.1f}C or Avg Valve {avg_level:.1f}% < {off_valve:.1f}%)")
-            return True
-        return False
+    def _autoh_hysteresis(self, current_ch_state, current_temp, avg_level):
+        """Applies the AUTOH on/off hysteresis to the current CH state.
 
-    def _should_enable_heating(self, current_temp, avg_level):
-        """Check if heating should be enabled based on temperature and valve levels.
-        
         Args:
-            current_temp: Current temperature reading
-            avg_level: Average valve level
-            
+            current_ch_state: CH enable state read at the start of the cycle
+            current_temp: Current temperature reading (may be None)
+            avg_level: Average valve level (may be None)
+
         Returns:
-            bool: True if heating should be enabled
+            bool: Target CH state
         """
-        # Reload config values each time to ensure we have the latest
-        on_temp = self._config.get("AUTOH", "ON_TEMP")
-        on_valve = self._config.get("AUTOH", "ON_VALVE_LEVEL")
-
-        if (current_temp is not None and (current_temp < on_temp)) and (avg_level is not None and (avg_level > on_valve)):
-            logger.info(f"AutoHeat: Condition met to enable heating (Temp {current_temp:.1f}C < {on_temp:.1f}C and Avg Valve {avg_level:.1f}% > {on_valve:.1f}%)")
+        off_temp, off_valve, on_temp, on_valve = self._autoh_limits
+        if current_ch_state:
+            # Either condition turns heating off; a missing reading cannot trigger it
+            if (current_temp is not None and current_temp >= off_temp) or \
+               (avg_level is not None and avg_level < off_valve):
+                logger.info("AutoHeat: Condition met to disable heating (Temp %sC >= %.1fC or Avg Valve %s%% < %.1f%%)", current_temp, off_temp, avg_level, off_valve)
+                return False
+            return True
+        # Both conditions, with valid readings, are needed to turn heating on
+        if current_temp is not None and avg_level is not None and \
+           current_temp < on_temp and avg_level > on_valve:
+            logger.info("AutoHeat: Condition met to enable heating (Temp %.1fC < %.1fC and Avg Valve %.1f%% > %.1f%%)", current_temp, on_temp, avg_level, on_valve)
             return True
         return False
 
-    def _calculate_setpoint(self):
+    def _calculate_setpoint(self, cfg, current_level, current_temp, current_wind, current_sun):
         """Calculate the final setpoint by combining PID and feedforward outputs.
         
+        Args:
+            cfg: Config snapshot for this cycle
+            current_level: Average active valve level read by the caller
+            current_temp: Outside temperature read by the caller
+            current_wind: Wind speed read by the caller
+            current_sun: Illumination read by the caller
+
         Returns:
             float: Calculated setpoint temperature
         """
         if not self._pid:
             logger.error("AutoHeat: PID instance is None, cannot calculate setpoint. Using default.")
-            target_setpoint = self._config.get("OT", "MANUAL_HEATING_SETPOINT")
-            logger.warning(f"Falling back to manual/default setpoint: {target_setpoint}")
+            target_setpoint = cfg["MANUAL_HEATING_SETPOINT"]
+            logger.warning("Falling back to manual/default setpoint: %s", target_setpoint)
             return target_setpoint
 
-        # Get current conditions
-        current_level = self._hm.avg_active_valve
-        current_temp = self._hm.temperature
-        current_wind = self._hm.wind_speed 
-        current_sun = self._hm.illumination
-        
         # Fall back to manual heating if we don't have sensor data
         if current_level is None or current_temp is None:
             logger.warning("Missing essential sensor data (valve/temp), falling back to manual heating setpoint")
-            target_setpoint = self._config.get("OT", "MANUAL_HEATING_SETPOINT")
+            target_setpoint = cfg["MANUAL_HEATING_SETPOINT"]
             return target_setpoint
         
         # Calculate PID output
@@ -260,92 +370,91 @@ class HeatingController:
         if pid_output is None:
             logger.warning("PID output is None (possibly after reset), using minimum output")
             pid_output = self._pid.get_output_min()
-        logger.info(f"PID Update: current_level(valve)={current_level:.1f} -> BoilerTemp={pid_output:.2f}")
+        logger.info("PID Update: current_level(valve)=%.1f -> BoilerTemp=%.2f", current_level, pid_output)
         
         # Calculate feedforward compensation if we have weather data
-        if current_temp is not None and current_wind is not None and current_sun is not None:
+        if current_wind is not None and current_sun is not None:
             ff_output = self._feedforward.calculate(current_wind, current_temp, current_sun)
-            logger.info(f"FF Update: Wind={current_wind:.1f}, Temp={current_temp:.1f}, Sun={current_sun:.0f} -> Compensation={ff_output:.2f}")
+            logger.info("FF Update: Wind=%.1f, Temp=%.1f, Sun=%.0f -> Compensation=%.2f", current_wind, current_temp, current_sun, ff_output)
         else:
             logger.debug("Missing some weather data, skipping feedforward compensation")
             ff_output = 0.0
         
         # Combine outputs
         final_output = pid_output + ff_output
-        logger.info(f"Combined Output: PID={pid_output:.2f} + FF={ff_output:.2f} = {final_output:.2f}")
-        logger.debug(f"Active valve count: {self._hm.active_valve_count}")
-        logger.debug(f"Avg valve: {self._hm.avg_valve}")
-        logger.debug(f"Max valve: {self._hm.max_valve}")
-        logger.debug(f"Avg active valve: {self._hm.avg_active_valve}")
-        logger.debug(f"Sum valve positions: {self._hm.sum_valve_positions}")
+        logger.info("Combined Output: PID=%.2f + FF=%.2f = %.2f", pid_output, ff_output, final_output)
+        hm = self._hm
+        active_count = hm.active_valve_count
+        reporting = hm.reporting_valves
+        sum_positions = hm.sum_valve_positions
+        logger.debug("Active valve count: %s", active_count)
+        logger.debug("Avg valve: %s", hm.avg_valve)
+        logger.debug("Max valve: %s", hm.max_valve)
+        logger.debug("Avg active valve: %s", current_level)
+        logger.debug("Sum valve positions: %s", sum_positions)
         # Add check for active_valve_count and reporting_valves to prevent ZeroDivisionError in debug log
-        if self._hm.active_valve_count > 0 and self._hm.reporting_valves > 0:
-            debug_calc_val = self._hm.sum_valve_positions / self._hm.reporting_valves * (self._hm.reporting_valves / self._hm.active_valve_count) ** 0.3
-            logger.debug(f"sum(valve_positions)/reporting_valves * (reporting_valves/active_valve_count)^0.3: {debug_calc_val:.3f}")
+        if active_count > 0 and reporting > 0:
+            debug_calc_val = sum_positions / reporting * (reporting / active_count) ** 0.3
+            logger.debug("sum(valve_positions)/reporting_valves * (reporting_valves/active_valve_count)^0.3: %.3f", debug_calc_val)
         else:
-            logger.debug(f"sum(...) calculation skipped (active_valve_count={self._hm.active_valve_count}, reporting_valves={self._hm.reporting_valves})")
+            logger.debug("sum(...) calculation skipped (active_valve_count=%s, reporting_valves=%s)", active_count, reporting)
 
         # Apply output limits
         # final_output = max(self._pid.get_output_min(), min(final_output, self._pid.get_output_max()))
         final_output = max(self._output_min, min(final_output, self._output_max))
         #round to 0.5
         final_output = round(final_output * 2) / 2
-        logger.debug(f"Final output: {final_output:.2f}")
+        logger.debug("Final output: %.2f", final_output)
         return final_output
 
-    def _handle_auto_heating(self):
-        """Determines target state and setpoint for Automatic Heating/PID mode."""
+    def _handle_auto_heating(self, cfg, current_ch_state, inputs):
+        """Determines target state and setpoint for Automatic Heating/PID mode.
+
+        Args:
+            cfg: Config snapshot for this cycle
+            current_ch_state: CH enable state read at the start of the cycle
+            inputs: (temperature, avg_active_valve, wind_speed, illumination) from the Homematic snapshot
+        """
         logger.debug("MODE: Automatic Heating/PID")
         
         # Default values
-        default_off_sp = self._config.get("OT", "OFF_SETPOINT", DEFAULT_OT_OFF_SETPOINT) #todo: move this to some initialization
+        default_off_sp = cfg["OFF_SETPOINT"]
         target_heating_state = False
         target_setpoint = default_off_sp
+        current_temp, avg_level, current_wind, current_sun = inputs
         
         # Check for overrides
-        override_state, override_active = self._check_override_flags()
-        if override_active:
-            target_heating_state = override_state
+        override = self._take_override()
+        if override is not None:
+            target_heating_state = override
         else:
-            # Get current state and readings
-            current_ch_state = self._ot.is_ch_enabled()
-            current_temp = self._hm.temperature
-            avg_level = self._hm.avg_active_valve
-            
             # Determine new state based on current conditions
-            if current_ch_state and self._should_disable_heating(current_temp, avg_level):
-                target_heating_state = False
-            elif not current_ch_state and self._should_enable_heating(current_temp, avg_level):
-                target_heating_state = True
-            else:
-                target_heating_state = current_ch_state  # Maintain current state
+            target_heating_state = self._autoh_hysteresis(current_ch_state, current_temp, avg_level)
         
         # Calculate setpoint if heating should be on
         if target_heating_state:
-            target_setpoint = self._calculate_setpoint()
+            target_setpoint = self._calculate_setpoint(cfg, avg_level, current_temp, current_wind, current_sun)
         else:
-            logger.debug(f"AutoHeat: Heating OFF. Target CS={default_off_sp}")
+            logger.debug("AutoHeat: Heating OFF. Target CS=%s", default_off_sp)
             
         return target_heating_state, target_setpoint
 
-    def _handle_manual_heating(self):
+    def _handle_manual_heating(self, cfg):
         """Determines target state and setpoint for Manual Heating mode."""
         logger.debug("MODE: Manual Heating Control")
         
-        default_off_sp = self._config.get("OT", "OFF_SETPOINT", DEFAULT_OT_OFF_SETPOINT) #todo: move this to some initialization
+        default_off_sp = cfg["OFF_SETPOINT"]
         target_heating_state = False  # Default state is OFF
         target_setpoint = default_off_sp
 
-        # Use _config.get directly for boolean
-        manual_heating_desired = self._config.get("OT", "ENABLE_HEATING")
+        manual_heating_desired = cfg["ENABLE_HEATING"]
         target_heating_state = manual_heating_desired
         
         if target_heating_state:
-            # Use _config.get directly for float
-            manual_setpoint = self._config.get("OT", "MANUAL_HEATING_SETPOINT")
+            manual_setpoint = cfg["MANUAL_HEATING_SETPOINT"]
             target_setpoint = manual_setpoint  # Use Manual setpoint
-            logger.info(f"ManualHeat: Heating ON. Target CS={target_setpoint:.2f}")
+            logger.info("ManualHeat: Heating ON. Target CS=%.2f", target_setpoint)
         else:
-            logger.debug(f"ManualHeat: Heating OFF. Target CS={default_off_sp}")
+            logger.debug("ManualHeat: Heating OFF. Target CS=%s", default_off_sp)
             
         return target_heating_state, target_setpoint 
\ No newline at end of file
@@ -75,6 +75,7 @@ class OpenThermController():
         self.writer = uasyncio.StreamWriter(self.uart, {})
 
         self._status_data = {} # Parsed data from T/B messages
+        self._dirty_ids = set() # Data IDs whose raw value changed since the last take_dirty_ids()
         self._last_responses = {} # Stores last response string for each command code
         self._response_events = {} # Events to signal command responses
         self._command_lock = uasyncio.Lock()
@@ -184,7 +185,7 @@ class OpenThermController():
                 logger.error(f"Error in OTGW UART reader processing line '{line}': {e}")
                 gc.collect()
                 # Consider more robust error handling, maybe reset UART?
-                await uasyncio.sleep(5) # Avoid tight loop on persistent error
+                await uasyncio.sleep_ms(5000) # Avoid tight loop on persistent error
 
     def _parse_and_update_status(self, source, msg_type_raw, data_id, val_hb, val_lb):
         """Parses received status message data and updates _status_data."""
@@ -192,6 +193,9 @@ class OpenThermController():
 
         parsed_value = None
         raw_value = (val_hb << 8) | val_lb
+        prev = self._status_data.get(data_id)
+        if prev is None or prev['raw_value'] != raw_value:
+            self._dirty_ids.add(data_id)
 
         try:
             # --- Add parsing logic based on Data ID ---
@@ -283,7 +287,7 @@ class OpenThermController():
         """Task to periodically send commands to maintain control if needed."""
         logger.info("OTGW keep-alive task started.")
         while True:
-            await uasyncio.sleep(KEEP_ALIVE_INTERVAL)
+            await uasyncio.sleep_ms(KEEP_ALIVE_INTERVAL * 1000)
             if self._is_controller_active:
                 now = time.time()
                 resend_needed = False
@@ -591,6 +595,12 @@ class OpenThermController():
         # Consider returning a deep copy if modification by caller is a concern
         return self._status_data
 
+    def take_dirty_ids(self):
+        """Returns the set of Data IDs whose value changed since the previous call, and starts a new one."""
+        dirty = self._dirty_ids
+        self._dirty_ids = set()
+        return dirty
+
     def get_last_response(self, cmd_code):
         """Returns the last received response string for a command code."""
         return self._last_responses.get(cmd_code)
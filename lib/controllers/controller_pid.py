@@ -6,6 +6,13 @@ PID control algorithm with configurable gains and limits.
 """
 
 import time
+try:
+    import micropython
+except ImportError:  # CPython: the code emitter decorators become no-ops
+    class micropython:
+        @staticmethod
+        def native(f):
+            return f
 # Import the logger instance initialized elsewhere (e.g., in main or initialization)
 from managers.manager_logger import Logger
 
@@ -34,8 +41,11 @@ class PIDController:
                  integral_accumulation_range,
                  valve_input_min, valve_input_max,
                  time_factor,
-                 output_deadband):
-        """Initialize the PID controller with control parameters."""
+                 output_deadband,
+                 clock=None):
+        """Initialize the PID controller with control parameters.
+        clock: optional callable returning the time in seconds (e.g. a simulated clock in tests);
+        defaults to ticks_ms on MicroPython and time.time() elsewhere."""
         # PID parameters
         self.kp = kp
         self.ki = ki
@@ -47,6 +57,7 @@ class PIDController:
         self.valve_input_max = valve_input_max
         self.time_factor = time_factor
         self.output_deadband = output_deadband
+        self._clock = clock
         self.last_output = None
         self.last_applied_output = None
 
@@ -65,12 +76,14 @@ class PIDController:
         # Validate input range
         if self.valve_input_min >= self.valve_input_max:
             raise ValueError("valve_input_min must be strictly less than valve_input_max")
+        self._update_valve_scale()
 
         # Internal state variables
         self._integral = 0.0
         self._previous_error = 0.0
         self._last_time_ref = None
 
+    @micropython.native
     def _calculate_pid(self, error, dt):
         """Calculate PID terms based on current error and time delta."""
         # Proportional term
@@ -93,11 +106,12 @@ class PIDController:
             d_term = 0.0
         
         self._previous_error = error
-        logger.debug(f"PID setpoint: {self.setpoint}")
-        logger.debug(f"PID error: {error}")
-        logger.debug(f"PID terms: Integral={self._integral:.3f}, P={p_term:.3f}, I={i_term:.3f}, D={d_term:.3f}")
+        logger.debug("PID setpoint: %s", self.setpoint)
+        logger.debug("PID error: %s", error)
+        logger.debug("PID terms: Integral=%.3f, P=%.3f, I=%.3f, D=%.3f", self._integral, p_term, i_term, d_term)
         return p_term + i_term + d_term
 
+    @micropython.native
     def update(self, current_level):
         """
         Update the controller state and calculate new output.
@@ -109,7 +123,10 @@ class PIDController:
             float: The calculated control output (target boiler temperature)
         """
         # Calculate time delta
-        if _use_ticks_ms:
+        clock = self._clock
+        if clock is not None:
+            current_time = clock()
+        elif _use_ticks_ms:
             current_time = time.ticks_ms()
         else:
             current_time = _get_time()
@@ -118,7 +135,7 @@ class PIDController:
             self._last_time_ref = current_time
             return 0  # Return 0 on first update
             
-        if _use_ticks_ms:
+        if _use_ticks_ms and clock is None:
             dt = time.ticks_diff(int(current_time), int(self._last_time_ref)) / 1000.0  # Convert to seconds
         else:
             dt = current_time - self._last_time_ref
@@ -135,8 +152,7 @@ class PIDController:
         elif current_level > self.valve_input_max:
             scaled_input = 100.0
         else:
-            scaled_input = ((current_level - self.valve_input_min) / 
-                          (self.valve_input_max - self.valve_input_min)) * 100.0
+            scaled_input = (current_level - self.valve_input_min) * self._valve_scale
         
         # Calculate error # STUPID AI CHANGED THIS THE OTHER WAY ROUND. STOP TOUCHING THIS CODE.
         error = scaled_input - self.setpoint 
@@ -164,16 +180,20 @@ class PIDController:
         if abs(self.output_min - output_min) > _FLOAT_TOLERANCE:
             old_val = self.output_min
             self.output_min = output_min
-            logger.info(f"PID output_min updated from {old_val} to: {output_min}")
+            logger.info("PID output_min updated from %s to: %s", old_val, output_min)
             self._update_integral_limits()
 
     def set_output_max(self, output_max):
         if abs(self.output_max - output_max) > _FLOAT_TOLERANCE:
             old_val = self.output_max
             self.output_max = output_max
-            logger.info(f"PID output_max updated from {old_val} to: {output_max}")
+            logger.info("PID output_max updated from %s to: %s", old_val, output_max)
             self._update_integral_limits()
 
+    def _update_valve_scale(self):
+        """Precomputes the valve-level to percent factor so update() needs no division."""
+        self._valve_scale = 100.0 / (self.valve_input_max - self.valve_input_min)
+
     def _update_integral_limits(self):
         """Update integral limits based on current settings."""
         if self.ki != 0 and self._integral_range is not None:
@@ -187,13 +207,13 @@ class PIDController:
     def set_kp(self, kp):
         """Sets the Proportional gain (Kp)."""
         if abs(self.kp - kp) > _FLOAT_TOLERANCE:
-            logger.info(f"PID Kp updated from {self.kp} to: {kp}")
+            logger.info("PID Kp updated from %s to: %s", self.kp, kp)
             self.kp = kp
 
     def set_ki(self, ki):
         """Sets the Integral gain (Ki)."""
         if abs(self.ki - ki) > _FLOAT_TOLERANCE:
-            logger.info(f"PID Ki updated from {self.ki} to: {ki}")
+            logger.info("PID Ki updated from %s to: %s", self.ki, ki)
             self.ki = ki
             if abs(self.ki) > _FLOAT_TOLERANCE:
                 if self._integral_range is None:
@@ -210,13 +230,13 @@ class PIDController:
     def set_kd(self, kd):
         """Sets the Derivative gain (Kd)."""
         if abs(self.kd - kd) > _FLOAT_TOLERANCE:
-            logger.info(f"PID Kd updated from {self.kd} to: {kd}")
+            logger.info("PID Kd updated from %s to: %s", self.kd, kd)
             self.kd = kd
 
     def set_setpoint(self, setpoint):
         """Sets the target setpoint."""
         if abs(self.setpoint - setpoint) > _FLOAT_TOLERANCE:
-            logger.info(f"PID Setpoint updated from {self.setpoint} to: {setpoint}")
+            logger.info("PID Setpoint updated from %s to: %s", self.setpoint, setpoint)
             self.setpoint = setpoint
 
     def set_valve_input_min(self, valve_min):
@@ -225,8 +245,9 @@ class PIDController:
             logger.error(f"Invalid valve_input_min ({valve_min}): must be < valve_input_max ({self.valve_input_max})")
             return
         if abs(self.valve_input_min - valve_min) > _FLOAT_TOLERANCE:
-            logger.info(f"PID valve_input_min updated from {self.valve_input_min} to: {valve_min}")
+            logger.info("PID valve_input_min updated from %s to: %s", self.valve_input_min, valve_min)
             self.valve_input_min = valve_min
+            self._update_valve_scale()
 
     def set_valve_input_max(self, valve_max):
         """Sets the maximum valve input value for scaling."""
@@ -234,13 +255,14 @@ class PIDController:
             logger.error(f"Invalid valve_input_max ({valve_max}): must be > valve_input_min ({self.valve_input_min})")
             return
         if abs(self.valve_input_max - valve_max) > _FLOAT_TOLERANCE:
-            logger.info(f"PID valve_input_max updated from {self.valve_input_max} to: {valve_max}")
+            logger.info("PID valve_input_max updated from %s to: %s", self.valve_input_max, valve_max)
             self.valve_input_max = valve_max
+            self._update_valve_scale()
 
     def set_output_deadband(self, deadband):
         """Sets the output deadband value."""
         if abs(self.output_deadband - deadband) > _FLOAT_TOLERANCE:
-            logger.info(f"PID output_deadband updated from {self.output_deadband} to: {deadband}")
+            logger.info("PID output_deadband updated from %s to: %s", self.output_deadband, deadband)
             self.output_deadband = deadband
 
     def set_integral_accumulation_range(self, range_value):
@@ -257,7 +279,7 @@ class PIDController:
             self._integral_range = range_value / self.ki
             self._integral_min = -self._integral_range
             self._integral_max = self._integral_range
-            logger.info(f"PID integral_range updated from {old_range} to: {range_value}")
+            logger.info("PID integral_range updated from %s to: %s", old_range, range_value)
 
     def reset(self):
         """Resets the controller's internal state."""
@@ -106,7 +106,7 @@ class LCD1602(LCD):
 
         Args:
             char_code (int): The code (0-7) for the character.
-            pattern_bytes (list[int]): A list of 8 bytes representing the 5x8 pattern.
+            pattern_bytes (bytes | memoryview | list[int]): The 8 rows of the 5x8 pattern.
         """
         if not (0 <= char_code <= 7):
             logger.error("Custom character code must be 0-7."); return
@@ -10,6 +10,13 @@ class Portexpander:
     OLATB = 0x15
     GPPUA = 0x0C
     GPPUB = 0x0D
+    GPINTENA = 0x04
+    GPINTENB = 0x05
+    INTCONA = 0x08
+    INTCONB = 0x09
+    IOCON = 0x0A
+    IOCON_MIRROR = 0x40 # INTA/INTB both signal changes on either port
+    IOCON_ODR = 0x04    # INT pins open-drain (active low, needs a pull-up)
 
     def __init__(self, i2c, address=0x20):
         self.i2c = i2c
@@ -18,33 +25,70 @@ class Portexpander:
         self._iodirb = 0xFF
         self._olata = 0x00
         self._olatb = 0x00
-        self._write_register(self.IODIRA, self._iodira)
-        self._write_register(self.IODIRB, self._iodirb)
+        self._write_pair(self.IODIRA, self._iodira, self._iodirb)
+        self._gppua = self._read_register(self.GPPUA)
+        self._gppub = self._read_register(self.GPPUB)
+        # Between begin_batch() and commit(), direction/pull-up changes only update the shadows
+        self._batch = False
 
     def _write_register(self, reg, value):
         self.i2c.writeto_mem(self.address, reg, bytes([value]))
 
+    def _write_pair(self, reg_a, value_a, value_b):
+        """Writes an A/B register pair in one transaction (IOCON.BANK=0 keeps them adjacent, auto-increment)."""
+        self.i2c.writeto_mem(self.address, reg_a, bytes((value_a, value_b)))
+
+    def begin_batch(self):
+        """Defers pin direction and pull-up writes until commit(), e.g. while building several McpPins."""
+        self._batch = True
+
+    def commit(self):
+        """Writes the deferred direction and pull-up state: one transaction per register pair."""
+        self._batch = False
+        self._write_pair(self.IODIRA, self._iodira, self._iodirb)
+        self._write_pair(self.GPPUA, self._gppua, self._gppub)
+
     def _read_register(self, reg):
         return self.i2c.readfrom_mem(self.address, reg, 1)[0]
 
     def set_pullup(self, pin, enable):
         if pin < 8:
-            reg = self.GPPUA
-            current = self._read_register(reg)
             if enable:
-                current |= (1 << pin)
+                self._gppua |= (1 << pin)
             else:
-                current &= ~(1 << pin)
-            self._write_register(reg, current)
+                self._gppua &= ~(1 << pin)
+            if not self._batch:
+                self._write_register(self.GPPUA, self._gppua)
         else:
             pin -= 8
-            reg = self.GPPUB
-            current = self._read_register(reg)
             if enable:
-                current |= (1 << pin)
+                self._gppub |= (1 << pin)
             else:
-                current &= ~(1 << pin)
-            self._write_register(reg, current)
+                self._gppub &= ~(1 << pin)
+            if not self._batch:
+                self._write_register(self.GPPUB, self._gppub)
+
+    def set_interrupt_on_change(self, pin, enable):
+        """Enables interrupt-on-change (against the previous value) for an input pin.
+        The interrupt is cleared by reading the port, e.g. via read_pin()."""
+        if pin < 8:
+            inten, intcon = self.GPINTENA, self.INTCONA
+        else:
+            pin -= 8
+            inten, intcon = self.GPINTENB, self.INTCONB
+        mask = 1 << pin
+        self._write_register(intcon, self._read_register(intcon) & ~mask)
+        current = self._read_register(inten)
+        self._write_register(inten, (current | mask) if enable else (current & ~mask))
+
+    def set_interrupt_mirror(self, enable=True):
+        """Ties INTA and INTB together as open-drain outputs so one host pin sees changes on both ports."""
+        current = self._read_register(self.IOCON)
+        if enable:
+            current |= self.IOCON_MIRROR | self.IOCON_ODR
+        else:
+            current &= ~(self.IOCON_MIRROR | self.IOCON_ODR)
+        self._write_register(self.IOCON, current)
 
     def set_pin_mode(self, pin, mode):
         if pin < 8:
@@ -52,14 +96,16 @@ class Portexpander:
                 self._iodira &= ~(1 << pin)
             else:
                 self._iodira |= (1 << pin)
-            self._write_register(self.IODIRA, self._iodira)
+            if not self._batch:
+                self._write_register(self.IODIRA, self._iodira)
         else:
             pin -= 8
             if mode == "output":
                 self._iodirb &= ~(1 << pin)
             else:
                 self._iodirb |= (1 << pin)
-            self._write_register(self.IODIRB, self._iodirb)
+            if not self._batch:
+                self._write_register(self.IODIRB, self._iodirb)
 
     def write_pin(self, pin, value):
         if pin < 8:
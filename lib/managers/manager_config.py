@@ -19,14 +19,20 @@ class ConfigManager:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, filename_config:str):
+    def __init__(self, filename_config:str, defaults:Dict[str, Dict[str, Any]] = None):
         if self._initialized:
             return # Prevent re-initialization
         logger.debug(f"Initializing ConfigManager with filename: {filename_config}")
         self.filename_config = filename_config
         self.config = {} # Holds the parsed config (dict of dicts with types)
+        # Defaults table (same layout as config) consulted by get() when no default is passed
+        self._defaults = defaults if defaults is not None else {}
         # Observer pattern: Store listeners keyed by "section.key"
         self._listeners: Dict[str, List[Callable[[Any], None]]] = {}
+        # Bumped on every load and every changed value; lets readers cache derived state
+        self._version = 0
+        # True while in-memory config has changes not yet written to flash
+        self._dirty = False
         self._load_config()
         self._initialized = True # Mark as initialized
 
@@ -44,13 +50,15 @@ class ConfigManager:
                 
         try:
             with open(self.filename_config, 'r') as f:
-                loaded_data = json.load(f)
-                if isinstance(loaded_data, dict):
-                    self.config = loaded_data
-                    logger.info(f"Loaded config from {self.filename_config}")
-                else:
-                    logger.error(f"Invalid config format in {self.filename_config} (not a dictionary). Using empty config.")
-                    self.config = {}
+                data = f.read() # One read; json.load() pulls the stream a character at a time
+            loaded_data = json.loads(data)
+            data = None # Release the raw text before the parsed dict is used
+            if isinstance(loaded_data, dict):
+                self.config = loaded_data
+                logger.info(f"Loaded config from {self.filename_config}")
+            else:
+                logger.error(f"Invalid config format in {self.filename_config} (not a dictionary). Using empty config.")
+                self.config = {}
         except (OSError, ValueError) as e:
             # OSError -> File not found or read error
             # ValueError -> Invalid JSON
@@ -59,13 +67,42 @@ class ConfigManager:
         except Exception as e:
              logger.error(f"Unexpected error loading config {self.filename_config}: {e}")
              self.config = {}
+        self._coerce_types()
+        self._version += 1
+
+    def _coerce_types(self):
+        """Converts loaded values to the type of their default, once at load, so get() stays a plain lookup.
+        Values that cannot be converted are left as loaded."""
+        for section, defaults in self._defaults.items():
+            values = self.config.get(section)
+            if not isinstance(values, dict):
+                continue
+            for key, default in defaults.items():
+                value = values.get(key)
+                if value is None or default is None or type(value) is type(default):
+                    continue
+                if isinstance(value, float) and isinstance(default, int) and not isinstance(default, bool):
+                    continue # Never truncate a float setting that happens to have an int default
+                try:
+                    if isinstance(default, bool):
+                        value = str(value).strip().lower() in ("true", "1", "on")
+                    else:
+                        value = type(default)(value)
+                except (TypeError, ValueError):
+                    logger.warning(f"Config '{section}.{key}': cannot convert {repr(value)} to {type(default).__name__}")
+                    continue
+                values[key] = value
 
     def save_config(self):
-        """Save the current configuration to the JSON config file."""
+        """Save the current configuration to the JSON config file if it has unsaved changes."""
+        if not self._dirty:
+            return True # Nothing to write, spare the flash
         try:
+            # Serialise first, then one write, instead of many small writes from json.dump
+            data = json.dumps(self.config)
             with open(self.filename_config, 'w') as f:
-                # Use positional arguments only for MicroPython compatibility
-                json.dump(self.config, f) # No keyword args
+                f.write(data)
+            self._dirty = False
             logger.info(f"Config successfully saved to {self.filename_config}") 
             return True
         except Exception as e:
@@ -73,20 +110,32 @@ class ConfigManager:
             return False
 
     def get(self, section: str, key: str, default: Any = None) -> Any:
-        """Gets value, setting default (and saving) if missing. Preserves type from load/default."""    
-        section_dict = self.config.get(section)
-        
-        if isinstance(section_dict, dict) and key in section_dict:
-            return section_dict[key] # Return existing value (already typed)
-        else:
+        """Gets value, setting default if missing. Preserves type from load/default.
+        Without an explicit default, the value from the defaults table is used.
+        Filled-in defaults are only written by the next save_config(), so a burst of misses costs one write."""    
+        try:
+            return self.config[section][key] # Hit path: two lookups, no temporaries
+        except (KeyError, TypeError):
+            if default is None:
+                default = self._defaults.get(section, {}).get(key)
             # Section or key missing, use default
             logger.info(f"Config key '{section}.{key}' not found. Setting default: {repr(default)}")
-            # Set the default value (with its original type) and save
-            self.set(section, key, default) # set_value handles save and notification
+            # Set the default value (with its original type); saved later with the next save_config()
+            self.set(section, key, default, save=False)
             return default
 
-    def set(self, section: str, key: str, value: Any):
-        """Sets the value (preserving type), saves config, and notifies listeners if changed."""
+    @property
+    def version(self) -> int:
+        """Counter bumped on every load and every changed value; compare it to detect config changes."""
+        return self._version
+
+    def get_section(self, section: str) -> Dict[str, Any]:
+        """Returns the stored dict for a section (empty if missing). Treat it as read-only; use set() to change values."""
+        section_dict = self.config.get(section)
+        return section_dict if isinstance(section_dict, dict) else {}
+
+    def set(self, section: str, key: str, value: Any, save: bool = True):
+        """Sets the value (preserving type), saves config (unless save is False), and notifies listeners if changed."""
         # Ensure section exists
         if section not in self.config or not isinstance(self.config[section], dict):
             self.config[section] = {}
@@ -97,10 +146,12 @@ class ConfigManager:
 
         if value_changed:
             self.config[section][key] = value # Assign value directly (preserves type)
+            self._version += 1
+            self._dirty = True
             logger.debug(f"Config set: {section}.{key} = {value}")
             
             # Attempt to save the configuration
-            if not self.save_config():
+            if save and not self.save_config():
                  logger.error(f"Failed to save config after setting {section}.{key}")
                  # Decide if you want to proceed with notification even if save failed
                  # For now, we proceed.
@@ -113,19 +164,21 @@ class ConfigManager:
     def _notify_listeners(self, section: str, key: str, new_value: Any):
         """Notifies registered listeners about a configuration change."""
         key_path = f"{section}.{key}"
-        if key_path in self._listeners:
-            # logger.debug(f"Notifying listeners for {key_path}")
-            for callback in self._listeners[key_path]:
-                try:
-                    callback(new_value)
-                except Exception as e:
-                    logger.error(f"Error calling listener for {key_path}: {e}")
+        # Listeners subscribed to "*" are notified of every change
+        for path in (key_path, "*"):
+            if path in self._listeners:
+                # logger.debug(f"Notifying listeners for {path}")
+                for callback in self._listeners[path]:
+                    try:
+                        callback(new_value)
+                    except Exception as e:
+                        logger.error(f"Error calling listener for {key_path}: {e}")
 
     def subscribe(self, key_path: str, callback: Callable[[Any], None]):
         """Registers a callback function to be notified of changes to a specific config key.
 
         Args:
-            key_path (str): The configuration key path (e.g., "SECTION.KEY").
+            key_path (str): The configuration key path (e.g., "SECTION.KEY"), or "*" for any key.
             callback (Callable[[Any], None]): The function to call when the value changes.
                                                 It will receive the new value as an argument.
         """
@@ -1,6 +1,10 @@
-import json
 import time
+import uos
 from machine import reset
+from uasyncio import ThreadSafeFlag
+
+# Fatal error record: timestamp, type, message separated by ASCII unit separators
+_ERROR_RECORD = "%d\x1f%s\x1f%s\n"
 
 class Logger: #singleton
     """Manages error logging with minimal flash writes."""
@@ -12,7 +16,8 @@ class Logger: #singleton
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    ERROR_FILE = "lasterror.json"
+    ERROR_FILE = "fatal.log" # One record per line, newest last, see _ERROR_RECORD
+    ERROR_FILE_MAX = 4096    # Roll over (start a fresh file) past one flash erase block
     LOG_FILE = "log.txt"
 
     def __init__(self, debug_level=0):
@@ -20,16 +25,45 @@ class Logger: #singleton
             return  # Already initialized, do nothing
         self._initialized = True
 
-        self._last_error = None
+        # Newest record in ERROR_FILE, read once here and then kept in step with flush()/clear_error_log()
+        self._last_error = self._read_last_record()
+        # Fingerprint of that error; identical fatals are not rewritten, even across reboots
+        self._last_sig = self._record_sig(self._last_error)
+        # Fatal error waiting to be written by flush(); bursts of fatals cost one flash write
+        self._pending_error = None
+        self._in_flush = False
         self._debug_level = debug_level
         self._error_history = []  # Stores the last 3 errors and warnings
-        self._error_timestamps = []  # Tracks timestamps of recent errors for rate limiting
+        self._error_timestamps = []  # ticks_ms of recent errors for rate limiting
         self._max_error_history = 10
         self._error_rate_limit = 3
         self.error_rate_limiter_reached = False
+        self._limiter_evt = ThreadSafeFlag()  # Set when the rate limiter trips
         self._message_server = None # Add placeholder for the server instance
         print(f"Logger initialized with debug level {self._debug_level}")
 
+    @staticmethod
+    def _error_sig(error_type, message):
+        """Fingerprint of a fatal error; the timestamp is deliberately left out."""
+        return hash((error_type, message))
+
+    def _read_last_record(self):
+        """Returns the newest record in ERROR_FILE as a dict, or None."""
+        try:
+            with open(self.ERROR_FILE, 'r') as f:
+                data = f.read()
+            data = data.rstrip()
+            timestamp, error_type, message = data[data.rfind("\n") + 1:].split("\x1f", 2)
+            return {"timestamp": int(timestamp), "type": error_type, "message": message}
+        except (OSError, ValueError):
+            return None # No file, empty after clear_error_log(), or unreadable
+
+    def _record_sig(self, record):
+        """Returns the fingerprint of a stored record, or None if there is none."""
+        if record is None:
+            return None
+        return self._error_sig(record["type"], record["message"])
+
     def set_message_server(self, server_instance):
         """Injects the MessageServer instance for network logging."""
         self._message_server = server_instance
@@ -45,28 +79,52 @@ class Logger: #singleton
         if self._message_server:
             self._message_server.send(f"FATAL: {error_type} - {message}")
         
-        new_error = {
-            "timestamp": time.time(),
-            "type": error_type,
-            "message": message,
-        }
-
-        # Only write if error is different from last one
-        if self._last_error != new_error:
-            try:
-                with open(self.ERROR_FILE, 'w') as f:
-                    json.dump(new_error, f)
-                self._last_error = new_error
-            except Exception as e:
-                self._log_to_file(f"Failed to write error log: {e}", "ERROR")
+        message = str(message).replace("\n", " ") # Callers may pass the exception itself; records are one line
+        sig = self._error_sig(error_type, message)
+
+        # Only queue if error is different from last one (a repeating fault costs one flash write)
+        if sig != self._last_sig:
+            self._pending_error = {
+                "timestamp": time.time(),
+                "type": error_type,
+                "message": message,
+            }
+            self._last_sig = sig
 
         # Log to log.txt
-        self._log_to_file(f"FATAL: {error_type} - {message}", "ERROR")
+        self._log_to_file("ERROR", f"FATAL: {error_type} - {message}")
         if resetmachine:
+            self.flush() # Must reach flash before the reset
             reset()
 
-    def error(self, message):
+    def flush(self):
+        """Writes a pending fatal error to ERROR_FILE. Called before resets, from the periodic
+        status log and by get_last_error(); a no-op when nothing is pending."""
+        if self._pending_error is None or self._in_flush:
+            return
+        self._in_flush = True
+        try:
+            pending = self._pending_error
+            # Whole record encoded up front and handed to the VFS in one binary write
+            record = (_ERROR_RECORD % (pending["timestamp"], pending["type"], pending["message"])).encode()
+            try:
+                size = uos.stat(self.ERROR_FILE)[6]
+            except OSError:
+                size = 0
+            # Append one line; only a full file is rewritten, keeping older records meanwhile
+            with open(self.ERROR_FILE, 'wb' if size + len(record) > self.ERROR_FILE_MAX else 'ab') as f:
+                f.write(record)
+            self._last_error = pending
+            self._pending_error = None
+        except Exception as e:
+            self._log_to_file("ERROR", f"Failed to write error log: {e}")
+        finally:
+            self._in_flush = False
+
+    def error(self, message, *args):
         """Logs a non-fatal error to log.txt and tracks it for rate limiting."""
+        if args:
+            message = message % args
         print(f"ERROR: {message}")
         if self._message_server:
             self._message_server.send(f"ERROR: {message}")
@@ -74,32 +132,40 @@ class Logger: #singleton
         self._track_error_rate()
         self._add_to_history("ERROR", message)
 
-    def warning(self, message):
+    def warning(self, message, *args):
         """Logs a warning message to the history."""
+        if args:
+            message = message % args
         if self._debug_level>=1:
             print(f"WARNING: {message}")
             if self._message_server:
                  self._message_server.send(f"WARNING: {message}")
         self._add_to_history("WARNING", message)
 
-    def info(self, message):
-        """Logs an informational message."""
+    def info(self, message, *args):
+        """Logs an informational message. Formats message % args only if the level is enabled."""
         if self._debug_level>=2:
+            if args:
+                message = message % args
             print(f"INFO: {message}")
             if self._message_server:
                 self._message_server.send(f"INFO: {message}")
         #self._add_to_history("INFO", message) 
 
-    def debug(self, message):
-        """Logs a debug message."""
+    def debug(self, message, *args):
+        """Logs a debug message. Formats message % args only if the level is enabled."""
         if self._debug_level>=3:
+            if args:
+                message = message % args
             print(f"DEBUG: {message}")
             if self._message_server:
                 self._message_server.send(f"DEBUG: {message}")
 
-    def trace(self, message):
-        """Logs a trace message."""
+    def trace(self, message, *args):
+        """Logs a trace message. Formats message % args only if the level is enabled."""
         if self._debug_level>=4:
+            if args:
+                message = message % args
             print(f"TRACE: {message}")
             if self._message_server:
                 self._message_server.send(f"TRACE: {message}")
@@ -114,17 +180,25 @@ class Logger: #singleton
 
     def _track_error_rate(self):
         """Tracks the rate of errors and sets the rate limiter flag if exceeded."""
-        current_time = time.time()
+        # ticks_ms stays a small int; time.time() is past the small-int range on rp2 and allocates
+        current_time = time.ticks_ms()
         self._error_timestamps.append(current_time)
 
         # Remove timestamps older than 1 minute
-        self._error_timestamps = [t for t in self._error_timestamps if current_time - t <= 60]
+        ticks_diff = time.ticks_diff
+        self._error_timestamps = [t for t in self._error_timestamps if ticks_diff(current_time, t) <= 60000]
 
         # Check if rate limit is exceeded
         if len(self._error_timestamps) > self._error_rate_limit:  # More than 1 error per minute
+            if not self.error_rate_limiter_reached:
+                self._limiter_evt.set()
             self.error_rate_limiter_reached = True
             self._log_to_file("ERROR", f"Error rate limiter triggered: {len(self._error_timestamps)} errors in the last minute")
 
+    async def wait_rate_limited(self):
+        """Suspends until the error rate limiter trips."""
+        await self._limiter_evt.wait()
+
     def reset_error_rate_limiter(self):
         """Resets the error rate limiter flag."""
         self.error_rate_limiter_reached = False
@@ -137,20 +211,17 @@ class Logger: #singleton
             self._error_history.pop(0)
 
     def get_last_error(self):
-        """Returns the last fatal error if it exists."""
-        try:
-            with open(self.ERROR_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return None
+        """Returns the last fatal error if it exists. Served from memory; the file is only read at start-up."""
+        self.flush()
+        return self._last_error
 
     def get_current_log(self):
         """Returns the current log as a string."""
         try:
             with open(self.LOG_FILE, 'r') as f:
                 return f.read()
-        except:
-            return ""
+        except OSError:
+            return "" # No log written yet
 
     def get_error_warning_history(self):
         """Returns the last 3 errors and warnings."""
@@ -159,9 +230,17 @@ class Logger: #singleton
     def clear_error_log(self):
         """Clears the error log file."""
         try:
-            with open(self.ERROR_FILE, 'w') as f:
-                f.write("")
+            # MicroPython files have no truncate(); reopening with 'wb' is the only way to empty
+            # one, so it is skipped when the file is already empty or missing
+            try:
+                size = uos.stat(self.ERROR_FILE)[6]
+            except OSError:
+                size = 0
+            if size:
+                open(self.ERROR_FILE, 'wb').close()
             self._last_error = None
-        except Exception as e:
-            self._log_to_file(f"Failed to clear error log: {e}", "ERROR")
+            self._last_sig = None
+            self._pending_error = None
+        except OSError as e:
+            self._log_to_file("ERROR", f"Failed to clear error log: {e}")
 
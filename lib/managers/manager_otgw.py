@@ -1,5 +1,6 @@
 import uasyncio
 import time
+from collections import namedtuple
 from controllers.controller_otgw import OpenThermController, OTGW_RESPONSE_OK, OTGW_RESPONSE_TIMEOUT, OTGW_RESPONSE_UNKNOWN
 from managers.manager_logger import Logger
 
@@ -14,6 +15,15 @@ CMD_STATUS_TIMEOUT = "timeout"
 CMD_STATUS_ERROR = "error"
 CMD_STATUS_VALIDATION_ERROR = "validation_error"
 
+# Boiler state read together once per control cycle, see OpenThermManager.snapshot()
+OTState = namedtuple("OTState", ("active", "ch_enabled", "dhw_enabled", "dhw_sp", "control_sp"))
+
+# Last known outcome of a command, see OpenThermManager.get_command_status()
+CommandState = namedtuple("CommandState", ("status", "result", "error_code", "last_update"))
+
+# Order in which batched commands are sent on commit(); codes not listed follow in queue order
+_BATCH_ORDER = ("TCtrl", "CS0", "CH", "CS", "HW", "SW")
+
 
 class OpenThermManager:
     """
@@ -23,16 +33,20 @@ class OpenThermManager:
     def __init__(self, controller: OpenThermController):
         self.controller = controller
         # Stores the state of the last issued command for each type
-        # Key: command code (e.g., "CS", "SW"), Value: dict
+        # Key: command code (e.g., "CS", "SW"), Value: CommandState
         self._command_states = {}
-        
+        # Keys of _command_states in sorted order, extended when a code is first recorded
+        self._sorted_codes = []
+        # Commands queued between begin_batch() and commit(), keyed by command code (last write wins)
+        self._batch = None
+
     
     async def start(self):
         """Starts the underlying controller and waits briefly for UART setup."""
         logger.info("Manager starting controller...")
         await self.controller.start()
         # Allow some time for UART connection after controller tasks start
-        await uasyncio.sleep(2)
+        await uasyncio.sleep_ms(2000)
         logger.info("Manager finished starting controller.")
 
     async def stop(self):
@@ -69,34 +83,40 @@ class OpenThermManager:
                          self._update_command_state(cmd_code, CMD_STATUS_ERROR, result=response_data, error_code=status_code)
                 else:
                     # Unknown 2-element tuple format
-                    logger.warning(f"Command {cmd_code} controller method returned unexpected 2-tuple format: {result}. Assuming error.")
+                    logger.warning("Command %s controller method returned unexpected 2-tuple format: %s. Assuming error.", cmd_code, result)
                     self._update_command_state(cmd_code, CMD_STATUS_ERROR, result=repr(result), error_code=OTGW_RESPONSE_UNKNOWN)
             else:
                  # Assume other return types indicate an unexpected issue or simple success
-                 logger.warning(f"Command {cmd_code} controller method returned unexpected type: {type(result)}. Assuming success.")
+                 logger.warning("Command %s controller method returned unexpected type: %s. Assuming success.", cmd_code, type(result))
                  self._update_command_state(cmd_code, CMD_STATUS_SUCCESS, result=repr(result), error_code=OTGW_RESPONSE_OK)
 
         except Exception as e:
-            logger.error(f"Exception during command task {cmd_code}: {e}")
+            logger.error("Exception during command task %s: %s", cmd_code, e)
             self._update_command_state(cmd_code, CMD_STATUS_ERROR, result=str(e), error_code=OTGW_RESPONSE_UNKNOWN)
 
     def _update_command_state(self, cmd_code: str, status, result=None, error_code=None):
-        """Updates the internal state dictionary for a given command."""
-        self._command_states[cmd_code] = {
-            "status": status,
-            "result": result,         # Response data from OTGW or error message
-            "error_code": error_code, # OTGW_RESPONSE_... code
-            "last_update": time.time()
-        }
-        logger.info(f"Command {cmd_code} state updated: {status}") # Optional logging
+        """Records the state of a given command.
+        result is the OTGW response data or an error message, error_code an OTGW_RESPONSE_... code."""
+        states = self._command_states
+        if cmd_code not in states:
+            codes = self._sorted_codes
+            codes.append(cmd_code)
+            codes.sort() # Only on a new code; the OpenTherm code set is small and fixed
+        states[cmd_code] = CommandState(status, result, error_code, time.time())
+        logger.info("Command %s state updated: %s", cmd_code, status) # Optional logging
 
     def _launch_command(self, cmd_code: str, controller_method, *args) -> bool:
         """Checks if command is pending, updates state, and launches task."""
         # Basic check: Don't launch if already pending (could be made more robust)
-        if self._command_states.get(cmd_code, {}).get("status") == CMD_STATUS_PENDING:
-            logger.warning(f"Command {cmd_code} is already pending. Ignoring new request.")
+        state = self._command_states.get(cmd_code)
+        if state is not None and state.status == CMD_STATUS_PENDING:
+            logger.warning("Command %s is already pending. Ignoring new request.", cmd_code)
             return False
 
+        if self._batch is not None:
+            self._batch[cmd_code] = (controller_method, args)
+            return True # Queued, sent on commit()
+
         self._update_command_state(cmd_code, CMD_STATUS_PENDING)
         uasyncio.create_task(self._execute_command_task(
             cmd_code,
@@ -105,13 +125,40 @@ class OpenThermManager:
         ))
         return True # Task launched
 
+    def begin_batch(self):
+        """Queues subsequent commands until commit() instead of launching each one."""
+        if self._batch is None:
+            self._batch = {}
+
+    def commit(self):
+        """Sends the queued commands in priority order from a single task. Returns the number sent."""
+        batch = self._batch
+        self._batch = None
+        if not batch:
+            return 0
+        items = []
+        for cmd_code in _BATCH_ORDER:
+            if cmd_code in batch:
+                items.append((cmd_code,) + batch.pop(cmd_code))
+        for cmd_code, entry in batch.items():
+            items.append((cmd_code,) + entry)
+        for item in items:
+            self._update_command_state(item[0], CMD_STATUS_PENDING)
+        uasyncio.create_task(self._execute_batch(items))
+        return len(items)
+
+    async def _execute_batch(self, items):
+        """Runs batched commands one after another."""
+        for cmd_code, controller_method, args in items:
+            await self._execute_command_task(cmd_code, controller_method, *args)
+
     # --- Public Command Methods (Non-blocking) ---
 
     # - Boiler Control -
     def take_control(self):
         # Refactored to use _launch_command for non-blocking execution
         # Uses "TCtrl" as the command code for tracking.
-        logger.info(f"Launching take_control task")
+        logger.info("Launching take_control task")
         return self._launch_command("TCtrl", self.controller.take_control)
 
     def relinquish_control(self):
@@ -163,10 +210,22 @@ class OpenThermManager:
         return self._launch_command("PM", self.controller.request_priority_message, data_id)
 
     # --- Public Status Getters ---
-    def get_command_status(self, cmd_code: str) -> dict | None:
+    def get_command_status(self, cmd_code: str) -> CommandState | None:
         """Gets the last known status of a launched command."""
         return self._command_states.get(cmd_code)
 
+    def command_states(self):
+        """Yields (command code, CommandState) for every command issued so far, sorted by code."""
+        states = self._command_states
+        for code in self._sorted_codes:
+            yield code, states[code]
+
+    def snapshot(self):
+        """Returns the state used by the control loop as one OTState, read in a single pass."""
+        c = self.controller
+        return OTState(c.is_active(), c.is_ch_enabled(), c.is_dhw_enabled(),
+                       c.get_dhw_setpoint(), c.get_control_setpoint())
+
     # Proxy getters from controller
     def get_status(self):
         return self.controller.get_status()
@@ -174,6 +233,9 @@ class OpenThermManager:
     def get_last_response(self, cmd_code):
         return self.controller.get_last_response(cmd_code)
 
+    def take_dirty_ids(self):
+        return self.controller.take_dirty_ids()
+
     def is_active(self):
         return self.controller.is_active()
 
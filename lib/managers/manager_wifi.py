@@ -1,5 +1,6 @@
 import time
 import network
+import uasyncio as asyncio
 from managers.manager_logger import Logger
 
 logger = Logger()
@@ -13,11 +14,13 @@ class WiFiManager:
     STATUS_CONNECTED = 2
     STATUS_ERROR = 3 # E.g., WLAN interface init failed
 
-    def __init__(self, ssid, password, hostname,retry_interval_ms=10000):
+    def __init__(self, ssid, password, hostname,retry_interval_ms=10000, state_event=None):
         self.ssid = ssid
         self.password = password
         self.hostname = hostname
         self.retry_interval_ms = retry_interval_ms
+        # Set whenever the link goes up or down; may be shared with other services
+        self._state_evt = state_event if state_event is not None else asyncio.Event()
         # self._wlan = None
         self._status = WiFiManager.STATUS_DISCONNECTED
         self._last_attempt_time = 0
@@ -59,6 +62,7 @@ class WiFiManager:
                 self._ip_address = None
                 self._wlan.active(False) # Deactivate to ensure clean reconnect
                 self._last_attempt_time = time.ticks_ms() # Start retry timer
+                self._state_evt.set()
             else:
                 # Still connected, maybe occasionally check IP just in case? (Optional)
                 pass
@@ -68,6 +72,7 @@ class WiFiManager:
                 self._ip_address = self._wlan.ifconfig()[0]
                 logger.info(f"WiFiManager: Connected. IP: {self._ip_address}")
                 self._status = WiFiManager.STATUS_CONNECTED
+                self._state_evt.set()
             elif self._wlan.status() < 0 or self._wlan.status() >= 3: # Error codes like WRONG_PASSWORD, NO_AP_FOUND, CONN_FAIL
                 logger.error(f"WiFiManager: Connection failed. Status code: {self._wlan.status()}. Retrying later.")
                 self._status = WiFiManager.STATUS_DISCONNECTED
@@ -13,6 +13,18 @@ class BoilerController:
         self.base_topic = base_topic
         self.mqtt_broker = mqtt_broker
 
+        # Topics, built once instead of on every publish/receive
+        self._t_status = f"{device_id}/status"
+        self._t_mode = f"{base_topic}/mode"
+        self._t_mode_set = f"{base_topic}/mode/set"
+        self._t_target_state = f"{base_topic}/target_temperature/state"
+        self._t_target_set = f"{base_topic}/target_temperature/set"
+        self._t_current = f"{base_topic}/current_temperature"
+        self._t_away_state = f"{base_topic}/away_mode/state"
+        self._t_away_set = f"{base_topic}/away_mode/set"
+        self._t_override_state = f"{base_topic}/override/state"
+        self._t_override_set = f"{base_topic}/override/set"
+
         # Internal state
         self.mode = "off"
         self.target_temp = 50.0
@@ -28,23 +40,23 @@ class BoilerController:
         topic = topic.decode()
         msg = msg.decode()
         logger.info(f"Received message on topic: {topic}, message: {msg}")
-        if topic == f"{self.base_topic}/mode/set":
+        if topic == self._t_mode_set:
             if msg in ["off", "eco", "heat"]:
                 self.mode = msg
 
-        elif topic == f"{self.base_topic}/target_temperature/set":
+        elif topic == self._t_target_set:
             try:
                 self.target_temp = float(msg)
             except:
                 pass
 
-        elif topic == f"{self.base_topic}/away_mode/set":
+        elif topic == self._t_away_set:
             self.away_mode = "ON" if msg.upper() == "ON" else "OFF"
 
-        elif topic == f"{self.base_topic}/override/set":
+        elif topic == self._t_override_set:
             self.manual_override = msg.upper() == "ON"
             self.client.publish(
-                f"{self.base_topic}/override/state",
+                self._t_override_state,
                 b"ON" if self.manual_override else b"OFF",
                 retain=True
             )
@@ -62,19 +74,19 @@ class BoilerController:
             "name": "Boiler",
             "unique_id": f"{self.device_id}_001",
             "device": device_info,
-            "mode_state_topic": f"{self.base_topic}/mode",
-            "mode_command_topic": f"{self.base_topic}/mode/set",
+            "mode_state_topic": self._t_mode,
+            "mode_command_topic": self._t_mode_set,
             "modes": ["off", "eco", "heat"],
-            "temperature_command_topic": f"{self.base_topic}/target_temperature/set",
-            "temperature_state_topic": f"{self.base_topic}/target_temperature/state",
-            "current_temperature_topic": f"{self.base_topic}/current_temperature",
-            "away_mode_state_topic": f"{self.base_topic}/away_mode/state",
-            "away_mode_command_topic": f"{self.base_topic}/away_mode/set",
+            "temperature_command_topic": self._t_target_set,
+            "temperature_state_topic": self._t_target_state,
+            "current_temperature_topic": self._t_current,
+            "away_mode_state_topic": self._t_away_state,
+            "away_mode_command_topic": self._t_away_set,
             "temperature_unit": "C",
             "min_temp": 30,
             "max_temp": 70,
             "temp_step": 0.5,
-            "availability_topic": f"{self.device_id}/status"
+            "availability_topic": self._t_status
         }
         
         self.client.publish(
@@ -89,9 +101,9 @@ class BoilerController:
             "name": "Manual Override",
             "unique_id": f"{self.device_id}_manual_override",
             "device": device_info,
-            "state_topic": f"{self.base_topic}/override/state",
-            "command_topic": f"{self.base_topic}/override/set",
-            "availability_topic": f"{self.device_id}/status"
+            "state_topic": self._t_override_state,
+            "command_topic": self._t_override_set,
+            "availability_topic": self._t_status
         }
         logger.info(f"Publishing override discovery for {self.device_id}")
         self.client.publish(
@@ -101,13 +113,14 @@ class BoilerController:
         )
         logger.info(f"Published override discovery for {self.device_id}")
     def publish_state(self):
-        self.client.publish(f"{self.device_id}/status", b"online", retain=True)
-        self.client.publish(f"{self.base_topic}/mode", self.mode.encode(), retain=True)
-        self.client.publish(f"{self.base_topic}/target_temperature/state", str(self.target_temp), retain=True)
-        self.client.publish(f"{self.base_topic}/current_temperature", str(self.current_temp), retain=True)
-        self.client.publish(f"{self.base_topic}/away_mode/state", self.away_mode.encode(), retain=True)
-        self.client.publish(
-            f"{self.base_topic}/override/state",
+        publish = self.client.publish
+        publish(self._t_status, b"online", retain=True)
+        publish(self._t_mode, self.mode.encode(), retain=True)
+        publish(self._t_target_state, str(self.target_temp), retain=True)
+        publish(self._t_current, str(self.current_temp), retain=True)
+        publish(self._t_away_state, self.away_mode.encode(), retain=True)
+        publish(
+            self._t_override_state,
             b"ON" if self.manual_override else b"OFF",
             retain=True
         )
@@ -118,14 +131,9 @@ class BoilerController:
             logger.info(f"Starting MQTT connection for {self.device_id}")
             self.client.connect()
             logger.info(f"Connected to MQTT for {self.device_id}")
-            self.client.subscribe(f"{self.base_topic}/mode/set")
-            logger.info(f"Subscribed to {self.base_topic}/mode/set for {self.device_id}")
-            self.client.subscribe(f"{self.base_topic}/target_temperature/set")
-            logger.info(f"Subscribed to {self.base_topic}/target_temperature/set for {self.device_id}")
-            self.client.subscribe(f"{self.base_topic}/away_mode/set")
-            logger.info(f"Subscribed to {self.base_topic}/away_mode/set for {self.device_id}")
-            self.client.subscribe(f"{self.base_topic}/override/set")
-            logger.info(f"Subscribed to {self.base_topic}/override/set for {self.device_id}")
+            for topic in (self._t_mode_set, self._t_target_set, self._t_away_set, self._t_override_set):
+                self.client.subscribe(topic)
+                logger.info("Subscribed to %s for %s", topic, self.device_id)
         except Exception as e:
             logger.error(f"MQTT startup error: {e}")
             return  # or retry logic
@@ -146,4 +154,4 @@ class BoilerController:
                 logger.info(f"Current temperature for {self.device_id} is {self.current_temp}")
             self.publish_state()
             logger.info(f"Published state for {self.device_id}")
-            await asyncio.sleep(10)
+            await asyncio.sleep_ms(10000)
@@ -288,5 +288,5 @@ class JsonRpcClient:
 
             wait_time = backoff_factor * (2 ** (attempt - 1))
             logger.info(f"Retrying in {wait_time:.2f} seconds...")
-            await asyncio.sleep(wait_time) # Use async sleep
+            await asyncio.sleep_ms(int(wait_time * 1000)) # Use async sleep
             gc.collect()
@@ -12,7 +12,7 @@ logger = Logger()
 class HomematicRPCClient:
     """ASYNC Client for interacting with a Homematic CCU3 via JSON-RPC."""
 
-    def __init__(self, rpc_client: JsonRpcClient, username, password):
+    def __init__(self, rpc_client: JsonRpcClient, username, password, state_event=None):
         """Initializes the Homematic client."""
         self.rpc_client = rpc_client
         self.username = username
@@ -24,6 +24,8 @@ class HomematicRPCClient:
         self._last_request_success = None
         self._last_request_time = 0
         self._last_error = None
+        # Set whenever the CCU connection status flips
+        self._state_evt = state_event if state_event is not None else asyncio.Event()
         logger.info(f"Async HomematicRPCClient initialized for user '{username}'.")
 
     def is_ccu_connected(self):
@@ -102,6 +104,7 @@ class HomematicRPCClient:
     async def _update_connection_status(self, response, error=None):
         try:
             """Updates the connection status based on the response or error."""
+            was_connected = self._last_request_success
             if response is not None and isinstance(response, dict):
                 # Any valid JSON-RPC response means we're connected
                 self._last_request_success = True
@@ -112,6 +115,8 @@ class HomematicRPCClient:
                 self._last_request_success = False
                 self._last_request_time = time.ticks_ms()
                 self._last_error = error
+            if self._last_request_success != was_connected:
+                self._state_evt.set()
         except Exception as e:
             logger.error("Error updating connection status")
             raise
@@ -265,14 +270,14 @@ class HomematicDataService:
     Provides login management and periodic data fetch for valve devices.
     Uses persistent caching for discovered devices.
     """
-    def __init__(self, base_url, username, password, valve_device_type, weather_device_type="HmIP-SWO"):
+    def __init__(self, base_url, username, password, valve_device_type, weather_device_type="HmIP-SWO", state_event=None):
         """
         Initialize the Homematic service with the CCU3 API URL and credentials.
         Tries to load the device cache from flash.
         """
         # JSON-RPC client for HTTP requests (async)
         self._rpc = JsonRpcClient(base_url)
-        self._hm = HomematicRPCClient(self._rpc, username, password)
+        self._hm = HomematicRPCClient(self._rpc, username, password, state_event)
         self.valve_device_type = valve_device_type  # e.g. "HmIP-eTRV" for thermostat valves
         self.weather_device_type = weather_device_type  # Default to "HmIP-SWO" for weather sensor
         # Last fetched data
@@ -527,6 +532,10 @@ class HomematicDataService:
         """Returns True if the last request to CCU was successful, False if it failed, None if no request made yet."""
         return self._hm.is_ccu_connected()
 
+    def snapshot(self):
+        """Returns the control inputs in one call: (temperature, avg_active_valve, wind_speed, illumination)."""
+        return (self.temperature, self.avg_active_valve, self.wind_speed, self.illumination)
+
     def start_fetch(self):
         """
         Begin an asynchronous fetch of device data.
@@ -58,7 +58,7 @@ class MessageServer:
             print(f"MessageServer: Server started successfully on {self._host}:{self._port}")
             # Keep the run task alive while the server runs
             while True:
-                await asyncio.sleep(60) # Sleep to prevent busy-waiting
+                await asyncio.sleep_ms(60000) # Sleep to prevent busy-waiting
         except OSError as e:
              print(f"MessageServer: Failed to start server on {self._host}:{self._port}: {e}")
              self._server = None # Ensure server object is None if start failed
@@ -16,18 +16,19 @@ from managers.manager_logger import Logger
 from flags import DEBUG
 logger = Logger(DEBUG)
 
-from initialization import initialize_hardware, initialize_services, setup_gui
+from initialization import initialize_hardware, initialize_services, setup_gui, ready_evt, state_evt
 # 3rd‑party / project modules
 
 from managers.gui import GUIManager
 from managers.manager_config import ConfigManager
-from platform_spec import ConfigFileName, factory_reset
+from platform_spec import ConfigFileName, factory_reset, factory_defaults
 
 # Import tasks from the new file
 from main_tasks import (
-    wifi_task, led_task, homematic_task, poll_buttons_task,
-    error_rate_limiter_task, main_status_task,
-    log_pid_output_task, log_memory_task, message_server_task, heating_controller_task # Import the new tasks
+    periodic, connectivity_task, poll_buttons_task,
+    error_rate_limiter_task,
+    message_server_task, heating_controller_task, # Import the new tasks
+    opentherm_start_task
 )
 
 DEVELOPMENT_MODE=1
@@ -39,17 +40,14 @@ DEVELOPMENT_MODE=1
 def schedule_tasks(loop, *, wifi, hm, led, ot_manager, hid, pid, cfg, message_server, wdt, heating_controller):
     # Tasks are now imported from main_tasks.py
     tasks_to_schedule = [
-        wifi_task(wifi), 
-        led_task(led), 
-        homematic_task(hm, wdt),
+        connectivity_task(wifi, hm, led, wdt, state_evt),
+        periodic("LED", led.update, 100, (OSError, ValueError)), # I2C pin write / unknown color
         poll_buttons_task(hid), 
-        main_status_task(hm, wifi, led),
         error_rate_limiter_task(hm, wifi, led),
-        heating_controller_task(heating_controller),
-        log_pid_output_task(pid),
-        log_memory_task(), # Add memory logging task
+        heating_controller_task(heating_controller, pid, ready_evt,
+                                cfg.get("PID", "UPDATE_INTERVAL_SEC")),
         message_server_task(message_server), # Add message server task
-        ot_manager.start()
+        opentherm_start_task(ot_manager, ready_evt)
     ]
         
     for coro in tasks_to_schedule:
@@ -64,7 +62,7 @@ async def main():  # noqa: C901 (Complexity will be reduced)
     # Initialize Config First
     try:
         logger.info("Initializing configuration...")
-        cfg = ConfigManager(ConfigFileName())
+        cfg = ConfigManager(ConfigFileName(), factory_defaults())
         logger.info("Configuration initialized.")
     except Exception as e:
         factory_reset(None, None)
@@ -78,6 +76,7 @@ async def main():  # noqa: C901 (Complexity will be reduced)
         wifi, homematic, pid, message_server, heating_controller = initialize_services(cfg) # Pass cfg
         gui = GUIManager(display, buttons) 
         setup_gui(gui, cfg, wifi, homematic, heating_controller._ot, pid, heating_controller)
+        cfg.save_config() # Persist defaults filled in during initialisation, in one write
 
         # Initialize Hardware Watchdog Timer (8 seconds timeout)
         logger.info("Initializing Hardware Watchdog (8s timeout)...")
@@ -117,3 +116,4 @@ async def main():  # noqa: C901 (Complexity will be reduced)
 
 if __name__ == "__main__":
     asyncio.run(main())
+    logger.flush() # main() returns early after non-resetting fatal errors
@@ -1,5 +1,7 @@
 import uasyncio as asyncio
+import utime
 import gc # Added import
+from micropython import const
 # from managers.manager_logger import Logger # No longer needed directly
 
 # Import the logger instance initialized in initialization.py
@@ -7,131 +9,110 @@ from managers.manager_logger import Logger
 
 logger = Logger()
 
+# Task timing, inlined by the compiler (int consts only; float settings live in the config defaults)
+_BUTTON_POLL_MS = const(20)       # Poll rate while a button is held or no IRQ is available
+_BUTTON_SETTLE_MS = const(5)      # Contact bounce settle after an edge IRQ
+_CONNECTIVITY_TICK_MS = const(5000)
+_STATUS_LOG_MS = const(60000)
+# The status log only forces a collection when free heap drops below this
+_GC_FREE_THRESHOLD = const(32 * 1024)
+
 # Remove the helper function - no longer needed with JSON types
 # def _config_str_to_bool(value, default=False):
 #     if value is None:
 #         return default
 #     return str(value).strip().lower() == "true"
 
-async def wifi_task(wifi):
-    while True:
-        try:
-            wifi.update()
-        except Exception as e:  # noqa: BLE001
-            logger.error(f"WiFi: {e}")
-        await asyncio.sleep(5)
-
-
-async def led_task(led):
+async def periodic(tag, fn, interval_ms, errors=Exception):
+    """Calls fn() every interval_ms, logging (not propagating) the given exception types under tag."""
+    sleep_ms = asyncio.sleep_ms
+    err = logger.error
     while True:
         try:
-            led.update()
-        except Exception as e:  # noqa: BLE001
-            logger.error(f"LED: {e}")
-        await asyncio.sleep_ms(100)
-
-
-async def homematic_task(hm, wdt):
-    while True:
-        try:
-            gc.collect() # Collect garbage
-            hm.update()
-            wdt.feed() # Feed watchdog
-        except Exception as e:  # noqa: BLE001
-            logger.error(f"HM: {e}")
-        await asyncio.sleep(5)
+            fn()
+        except errors as e:
+            err("%s: %s", tag, e)
+        await sleep_ms(interval_ms)
 
 
 async def poll_buttons_task(hid):
+    """Polls buttons while one is active; otherwise sleeps until a pin edge IRQ fires."""
+    has_irq = hid.has_irq()
+    wait_edge = hid.wait_edge
+    get_event = hid.get_event
+    is_idle = hid.is_idle
+    sleep_ms = asyncio.sleep_ms
     while True:
-        hid.get_event()
-        await asyncio.sleep_ms(20)
+        get_event()
+        if has_irq and is_idle():
+            await wait_edge()
+            await sleep_ms(_BUTTON_SETTLE_MS) # Let contact bounce settle
+        else:
+            await sleep_ms(_BUTTON_POLL_MS)
 
 
 async def error_rate_limiter_task(hm, wifi, led):
-    """Watch the logger's limiter flag and perform a quick reset cycle."""
-    while True:
-        if logger.error_rate_limiter_reached:
-            logger.warning("Error‑rate limiter TRIGGERED – running cooldown cycle")
-            try:
-                hm.set_paused(True)
-                wifi.disconnect()
-                led.set_color("red", blink=False)
-            except Exception as e:  # noqa: BLE001
-                logger.error(f"Limiter prep: {e}")
-
-            logger.reset_error_rate_limiter()
-
-            try:
-                hm.set_paused(False)
-                wifi.update()
-            except Exception as e:  # noqa: BLE001
-                logger.error(f"Limiter resume: {e}")
-        await asyncio.sleep(1)
-
-
-async def main_status_task(hm, wifi, led):
+    """Wait for the logger's limiter to trip and perform a quick reset cycle."""
     while True:
-        if wifi.is_connected():
-            hm.set_paused(False)
-            led.set_color("green" if hm.is_ccu_connected() else "magenta",
-                           blink=True, duration_on=50, duration_off=2000)
-        else:
+        await logger.wait_rate_limited()
+        if not logger.error_rate_limiter_reached:
+            continue # Reset from the menu before we got here
+        logger.warning("Error‑rate limiter TRIGGERED – running cooldown cycle")
+        try:
             hm.set_paused(True)
-            led.set_color("red", blink=True, duration_on=1000, duration_off=1000)
+            wifi.disconnect()
+            led.set_color("red", blink=False)
+        except (OSError, ValueError) as e: # network stack / LED color
+            logger.error("Limiter prep: %s", e)
 
-        await asyncio.sleep(1)
+        logger.reset_error_rate_limiter()
 
-async def pid_control_task(pid, hm, ot_manager, cfg_mgr, heating_controller):
-    """Periodically runs the heating controller's update method."""
-    logger.info("Starting PID/Manual Control task")
-    await asyncio.sleep(5)  # Initial delay
-
-    while True:
         try:
-            await heating_controller.update()
-            await asyncio.sleep(30)  # Use configurable interval if needed
-        except Exception as e:
-            logger.error(f"PID/Control Task Error: {e}")
-            await asyncio.sleep(30)  # Avoid rapid looping on error
-
-async def log_pid_output_task(pid):
-    """Periodically logs the last calculated PID output temperature."""
-    logger.info(f"Starting PID output logging task.")
-    # Initial delay aligns potentially with first PID calculation
-    await asyncio.sleep(60)
-
+            hm.set_paused(False)
+            wifi.update()
+        except (OSError, ValueError) as e:
+            logger.error("Limiter resume: %s", e)
+
+
+async def connectivity_task(wifi, hm, led, wdt, state_evt):
+    """Drives WiFi and Homematic updates and derives pause/LED state as soon as either reports a transition.
+    state_evt is the event both were constructed with, see initialize_services()."""
+    state_evt.set()  # derive the initial state on the first pass
+    last_led = None # Last (color, blink, on, off) applied
+    wifi_update = wifi.update
+    hm_update = hm.update
+    feed = wdt.feed
+    err = logger.error
+    wait_for_ms = asyncio.wait_for_ms
     while True:
         try:
-            last_output = pid.last_output
-            if last_output is not None:
-                logger.info(f"PID Last Output: {last_output:.2f}")
-            else:
-                logger.info("PID Last Output: None (PID not run yet?)")
-            
-            await asyncio.sleep(60)
-
-        except Exception as e:
-            logger.error(f"PID Log Task Error: {e}")
-            # Avoid rapid looping on error
-            await asyncio.sleep(60)
-
-async def log_memory_task():
-    """Periodically logs the free memory."""
-    logger.info("Starting Free Memory logging task.")
-    await asyncio.sleep(5) # Small initial delay
-
-    while True:
+            wifi_update()
+            hm_update()
+            feed() # Feed watchdog
+
+            if state_evt.is_set():
+                state_evt.clear()
+                if wifi.is_connected():
+                    hm.set_paused(False)
+                    new_led = ("green" if hm.is_ccu_connected() else "magenta", True, 50, 2000)
+                else:
+                    hm.set_paused(True)
+                    new_led = ("red", True, 1000, 1000)
+                if new_led != last_led:
+                    led.set_color(*new_led)
+                    last_led = new_led
+        except (OSError, ValueError) as e: # network stack / LED color
+            err("Connectivity: %s", e)
+        except MemoryError:
+            gc.collect()
+            err("Connectivity: out of memory")
+        except Exception as e: # This task feeds the watchdog; a crash here would reset the board
+            err("Connectivity (unexpected): %s", e)
+        # Periodic tick for retries and the watchdog, cut short when wifi/hm report a transition
         try:
-            free_memory = gc.mem_free()
-            logger.info(f"Free Memory: {free_memory} bytes")
-            gc.collect() # Optional: Run garbage collection after logging
-            await asyncio.sleep(60)
-
-        except Exception as e:
-            logger.error(f"Memory Log Task Error: {e}")
-            # Avoid rapid looping on error
-            await asyncio.sleep(60)
+            await wait_for_ms(state_evt.wait(), _CONNECTIVITY_TICK_MS)
+        except asyncio.TimeoutError:
+            pass
 
 async def message_server_task(server):
     """Runs the message server's main loop."""
@@ -141,17 +122,52 @@ async def message_server_task(server):
         logger.warning("Message Server task started, but server instance is None.")
         # Keep task alive but do nothing if server isn't there
         while True:
-            await asyncio.sleep(3600) # Sleep for a long time 
+            await asyncio.sleep_ms(3600000) # Sleep for a long time 
+
+async def opentherm_start_task(ot_manager, ready_evt):
+    """Starts the OpenTherm manager, then signals that the control loop may run."""
+    await ot_manager.start()
+    ready_evt.set()
 
-async def heating_controller_task(heating_controller):
-    """Periodically runs the heating controller's update method."""
+async def heating_controller_task(heating_controller, pid, ready_evt, interval_s=30):
+    """Runs the heating controller's update method on a fixed period and logs PID output and free memory every minute.
+    The period stretches up to 5x while cycles change nothing; a poke (config change) restores it."""
     logger.info("Starting Heating Controller task")
-    await asyncio.sleep(5)  # Initial delay
+    await ready_evt.wait()
+    interval_ms = int(interval_s * 1000)
+    next_tick = utime.ticks_ms()
+    next_log = utime.ticks_add(next_tick, _STATUS_LOG_MS)
+    unchanged_cycles = 0
+    mem_free = gc.mem_free
+    ticks_ms = utime.ticks_ms
+    ticks_add = utime.ticks_add
+    ticks_diff = utime.ticks_diff
+    update = heating_controller.update
+    wait_poke = heating_controller.wait_poke
+    info = logger.info
+    err = logger.error
 
     while True:
         try:
-            await heating_controller.update()
-            await asyncio.sleep(30)  # Use configurable interval if needed
+            changed = await update()
+            if ticks_diff(ticks_ms(), next_log) >= 0:
+                next_log = ticks_add(next_log, _STATUS_LOG_MS)
+                last_output = pid.last_output
+                if last_output is not None:
+                    info("PID Last Output: %.2f", last_output)
+                else:
+                    info("PID Last Output: None (PID not run yet?)")
+                free_memory = mem_free() # Once per minute, it walks the heap on some ports
+                info("Free Memory: %d bytes", free_memory)
+                if free_memory < _GC_FREE_THRESHOLD:
+                    gc.collect()
+                logger.flush() # Persist a queued fatal error, at most once a minute
         except Exception as e:
-            logger.error(f"Heating Controller Task Error: {e}")
-            await asyncio.sleep(30)  # Avoid rapid looping on error 
\ No newline at end of file
+            err("Heating Controller Task Error: %s", e)
+            changed = True # Keep the normal cadence while errors occur
+        unchanged_cycles = 0 if changed else unchanged_cycles + 1
+        # Fixed-phase schedule: the period does not stretch by the update's run time
+        next_tick = ticks_add(next_tick, interval_ms * min(5, 1 + unchanged_cycles // 4))
+        if await wait_poke(max(0, ticks_diff(next_tick, ticks_ms()))):
+            unchanged_cycles = 0
+            next_tick = ticks_ms()
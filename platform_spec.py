@@ -1,255 +1,74 @@
-# # Hardware configuration constants
-# I2C_ID = 1
-# I2C_SDA_PIN = 14
-# I2C_SCL_PIN = 15
-# MCP_ADDRESS = 0x20
+from micropython import const
+
+# Factory default configuration as one JSON constant: parsing it on demand builds the nested
+# dicts only when get_factory_config() is called. Floats keep their ".0" so they load as floats.
+_FACTORY_JSON = (
+    '{'
+    '"DEVICE":{"DEBUG":1},'
+    '"HARDWARE":{'
+        '"I2C":{"ID":1,"SDA_PIN":14,"SCL_PIN":15},'
+        '"MCP":{"ADDRESS":32},'  # 0x20
+        '"UART":{"ID":0,"TX_PIN":16,"RX_PIN":17,"BAUDRATE":9600},'
+        '"RGBLED":{"RED_PIN":6,"GREEN_PIN":8,"BLUE_PIN":7,"MCPPIN":true},'
+        '"BUTTONS":{"LEFT_PIN":4,"UP_PIN":3,"DOWN_PIN":2,"RIGHT_PIN":1,"SELECT_PIN":0,"MCPPIN":true},'
+        '"LCD":{"RW_PIN":14,"RS_PIN":15,"EN_PIN":13,"D4_PIN":12,"D5_PIN":11,"D6_PIN":10,"D7_PIN":9,"COLS":16,"ROWS":2,"MCPPIN":true}'
+    '},'
+    '"WIFI":{"SSID":"ssid","PASS":"pass","RESET_IMMUNE":true},'
+    '"CCU3":{"IP":"0.0.0.0","USER":"user","PASS":"pass","VALVE_DEVTYPE":"HmIP-eTRV","WEATHER_DEVTYPE":"HmIP-SWO","RESET_IMMUNE":true},'
+    # OFF_SETPOINT: control setpoint while CH is off; SETPOINT_TOLERANCE: setpoint comparison tolerance
+    '"OT":{"MAX_HEATING_SETPOINT":72.0,"MANUAL_HEATING_SETPOINT":55.0,"OFF_SETPOINT":20.0,"DHW_SETPOINT":50.0,"ENABLE_CONTROLLER":false,"ENABLE_HEATING":false,"ENABLE_DHW":true,"ENFORCE_DHW_SETPOINT":false,"SETPOINT_TOLERANCE":0.1},'
+    '"AUTOH":{"ENABLE":true,"OFF_TEMP":19.0,"OFF_VALVE_LEVEL":5.0,"ON_TEMP":15.0,"ON_VALVE_LEVEL":12.0},'
+    '"PID":{"KP":0.2,"KI":0.0005,"KD":0.02,"SETPOINT":10.0,"MIN_HEATING_SETPOINT":35.0,"UPDATE_INTERVAL_SEC":30,"VALVE_MIN":1.0,"VALVE_MAX":100.0,"OUTPUT_DEADBAND":0.5,"INTEGRAL_ACCUMULATION_RANGE":5.0},'
+    '"FEEDFORWARD":{"WIND_COEFF":0.1,"TEMP_COEFF":1.1,"SUN_COEFF":0.0001,"WIND_CHILL_COEFF":0.008,"BASE_TEMP_REF_OUTSIDE":10.0,"BASE_TEMP_BOILER":41.0},'
+    '"MQTT":{"BROKER":"broker","PORT":1883,"RESET_IMMUNE":true}'
+    '}'
+)
 
-# #OPENTHERM UART configuration
-# OT_UART_ID = 0
-# OT_UART_TX_PIN = 16
-# OT_UART_RX_PIN = 17
-# OT_UART_BAUDRATE = 9600
-
-# # RGB LED pin configuration
-# RGBLED_RED_PIN = 6
-# RGBLED_GREEN_PIN = 8
-# RGBLED_BLUE_PIN = 7
-
-# # Button pin configuration
-# BUTTON_LEFT_PIN = 4
-# BUTTON_UP_PIN = 3
-# BUTTON_DOWN_PIN = 2
-# BUTTON_RIGHT_PIN = 1
-# BUTTON_SELECT_PIN = 0
-
-# # LCD pin configuration
-# LCD_RW_PIN = 14
-# LCD_RS_PIN = 15
-# LCD_EN_PIN = 13
-# LCD_D4_PIN = 12
-# LCD_D5_PIN = 11
-# LCD_D6_PIN = 10
-# LCD_D7_PIN = 9
-
-# # LCD dimensions
-# LCD_COLS = 16
-# LCD_ROWS = 2
-
-
-# LCD custom character definitions
-DYNAMIC_CUSTOM_CHARS = [
-    # Char 0: Wifi nok, Valve nok, Boiler nok
-    [0x19, 0x13, 0x00, 0x19, 0x13, 0x00, 0x19, 0x13],
-    # Char 1: Wifi ok, Valve nok, Boiler nok
-    [0x1F, 0x1F, 0x00, 0x19, 0x13, 0x00, 0x19, 0x13],
-    # Char 2: Wifi nok, Valve ok, Boiler nok
-    [0x19, 0x13, 0x00, 0x1F, 0x1F, 0x00, 0x19, 0x13],
-    # Char 3: Wifi nok, Valve nok, Boiler ok
-    [0x19, 0x13, 0x00, 0x19, 0x13, 0x00, 0x1F, 0x1F],
-    # Char 4: Wifi ok, Valve nok, Boiler ok
-    [0x1F, 0x1F, 0x00, 0x19, 0x13, 0x00, 0x1F, 0x1F],
-    # Char 5: Wifi nok, Valve ok, Boiler ok
-    [0x19, 0x13, 0x00, 0x1F, 0x1F, 0x00, 0x1F, 0x1F],
-    # Char 6: Wifi ok, Valve ok, Boiler ok
-    [0x1F, 0x1F, 0x00, 0x1F, 0x1F, 0x00, 0x1F, 0x1F],
-]
-
-CUSTOM_CHARS = [
-    # Char 0: Lock
-    [0x0E, 0x11, 0x11, 0x1F, 0x1F, 0x1B, 0x1B, 0x1F],
-    # Char 1: Right Arrow '>'
-    [0x08, 0x0C, 0x0E, 0x0F, 0x0E, 0x0C, 0x08, 0x00],
-    # Char 2: (Empty placeholder)
-    [0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],
-    # Char 3: Boiler disconnected
-    [0x00, 0x00, 0x1F, 0x00, 0x00, 0x1F, 0x00, 0x00],
-    # Slot 4 — WiFi symbol (antenna)
-    [0x0E, 0x11, 0x04, 0x0A, 0x00, 0x04, 0x04, 0x00],
-    # Slot 5 — Valve OK
-    [0x0E, 0x0E, 0x04, 0x0A, 0x0B, 0x0A, 0x04, 0x04],
-    # Slot 6 — Valve Disconnected (striked)
-    [0x00, 0x11, 0x0A, 0x04, 0x0A, 0x11, 0x00, 0x00],
-    # Slot 7 — Boiler Connected
-    [0x04, 0x08, 0x1F, 0x00, 0x00, 0x1F, 0x01, 0x02]
-]
-
-
-# Default CCU3 device types
-DEFAULT_CCU3_VALVE_DEVTYPE = "HmIP-eTRV"
-DEFAULT_CCU3_WEATHER_DEVTYPE = "HmIP-SWO"
-
-# Default PID timing
-DEFAULT_PID_UPDATE_INTERVAL_SEC = 30
-
-# OpenTherm (OT) default configuration
-DEFAULT_OT_MAX_HEATING_SETPOINT = 72.0
-DEFAULT_OT_MANUAL_HEATING_SETPOINT = 55.0
-DEFAULT_OT_DHW_SETPOINT = 50.0
-DEFAULT_OT_ENABLE_CONTROLLER = False
-DEFAULT_OT_ENABLE_HEATING = False
-DEFAULT_OT_ENABLE_DHW = True
-DEFAULT_OT_ENFORCE_DHW_SETPOINT = False
-DEFAULT_OT_OFF_SETPOINT = 20.0  # Default control setpoint when heating is off
-DEFAULT_OT_SETPOINT_TOLERANCE = 0.1  # Tolerance for setpoint comparisons
-
-# Auto Heating (AUTOH) default configuration
-DEFAULT_AUTOH_ENABLE = True
-DEFAULT_AUTOH_OFF_TEMP = 19.0
-DEFAULT_AUTOH_OFF_VALVE_LEVEL = 5.0
-DEFAULT_AUTOH_ON_TEMP = 15.0
-DEFAULT_AUTOH_ON_VALVE_LEVEL = 12.0
+CONFIG_FILENAME = "config.json"
 
-# PID Controller default configuration
-DEFAULT_PID_KP = 0.2
-DEFAULT_PID_KI = 0.0005
-DEFAULT_PID_KD = 0.02
-DEFAULT_PID_SETPOINT = 10.0
-DEFAULT_PID_MIN_HEATING_SETPOINT = 35.0
-DEFAULT_PID_VALVE_MIN = 1.0
-DEFAULT_PID_VALVE_MAX = 100.0
-DEFAULT_PID_FF_WIND_COEFF = 0.1
-DEFAULT_PID_FF_TEMP_COEFF = 1.1
-DEFAULT_PID_FF_SUN_COEFF = 0.0001
-DEFAULT_PID_FF_WIND_CHILL_COEFF = 0.008
-DEFAULT_PID_BASE_TEMP_REF_OUTSIDE = 10.0
-DEFAULT_PID_BASE_TEMP_BOILER = 41.0
-DEFAULT_PID_OUTPUT_DEADBAND = 0.5
-DEFAULT_PID_INTEGRAL_ACCUMULATION_RANGE = 5.0
+_UART_TIMEOUT_MS = const(10)  # OTGW UART read and inter-character timeout
+_ENOENT = const(2)
 
-CONFIG_FILENAME = "config.json"
+_factory_template = None # Parsed once by factory_defaults(), shared by read-only users
 
 def get_factory_config():
     """Returns a new dictionary with factory default configuration."""
-    return {
-        "DEVICE": {
-            "DEBUG": 1,
-        },
-        "HARDWARE": {
-            "I2C": {
-                "ID": 1,
-                "SDA_PIN": 14,
-                "SCL_PIN": 15,
-            },
-            "MCP": {
-                "ADDRESS": 0x20,
-            },
-            "UART": {
-                "ID": 0,
-                "TX_PIN": 16,
-                "RX_PIN": 17,
-                "BAUDRATE": 9600,
-            },
-            "RGBLED": {
-                "RED_PIN": 6,
-                "GREEN_PIN": 8,
-                "BLUE_PIN": 7,
-                "MCPPIN": True,
-            },
-            "BUTTONS": {
-                "LEFT_PIN": 4,
-                "UP_PIN": 3,
-                "DOWN_PIN": 2,
-                "RIGHT_PIN": 1,
-                "SELECT_PIN": 0,
-                "MCPPIN": True,
-            },
-            "LCD": {
-                "RW_PIN": 14,
-                "RS_PIN": 15,
-                "EN_PIN": 13,
-                "D4_PIN": 12,
-                "D5_PIN": 11,
-                "D6_PIN": 10,
-                "D7_PIN": 9,
-                "COLS": 16,
-                "ROWS": 2,
-                "MCPPIN": True,
-            },
-        },
-        "WIFI": {
-            "SSID": "ssid",
-            "PASS": "pass",
-            "RESET_IMMUNE": True,
-        },
-        "CCU3": {
-            "IP": "0.0.0.0",
-            "USER": "user",
-            "PASS": "pass",
-            "VALVE_DEVTYPE": DEFAULT_CCU3_VALVE_DEVTYPE,
-            "WEATHER_DEVTYPE": DEFAULT_CCU3_WEATHER_DEVTYPE,
-            "RESET_IMMUNE": True,
-        },
-        "OT": {
-            "MAX_HEATING_SETPOINT": DEFAULT_OT_MAX_HEATING_SETPOINT,
-            "MANUAL_HEATING_SETPOINT": DEFAULT_OT_MANUAL_HEATING_SETPOINT,
-            "OFF_SETPOINT": DEFAULT_OT_OFF_SETPOINT, # this is the default control setpoint when CH is off
-            "DHW_SETPOINT": DEFAULT_OT_DHW_SETPOINT,
-            "ENABLE_CONTROLLER": DEFAULT_OT_ENABLE_CONTROLLER,
-            "ENABLE_HEATING": DEFAULT_OT_ENABLE_HEATING,
-            "ENABLE_DHW": DEFAULT_OT_ENABLE_DHW,
-            "ENFORCE_DHW_SETPOINT": DEFAULT_OT_ENFORCE_DHW_SETPOINT,
-        },
-        "AUTOH": {
-            "ENABLE": DEFAULT_AUTOH_ENABLE,
-            "OFF_TEMP": DEFAULT_AUTOH_OFF_TEMP,
-            "OFF_VALVE_LEVEL": DEFAULT_AUTOH_OFF_VALVE_LEVEL,
-            "ON_TEMP": DEFAULT_AUTOH_ON_TEMP,
-            "ON_VALVE_LEVEL": DEFAULT_AUTOH_ON_VALVE_LEVEL,
-        },
-        "PID": {
-            "KP": DEFAULT_PID_KP,
-            "KI": DEFAULT_PID_KI,
-            "KD": DEFAULT_PID_KD,
-            "SETPOINT": DEFAULT_PID_SETPOINT,
-            "UPDATE_INTERVAL_SEC": DEFAULT_PID_UPDATE_INTERVAL_SEC,
-            "VALVE_MIN": DEFAULT_PID_VALVE_MIN,
-            "VALVE_MAX": DEFAULT_PID_VALVE_MAX,
-            "OUTPUT_DEADBAND": DEFAULT_PID_OUTPUT_DEADBAND,
-            "INTEGRAL_ACCUMULATION_RANGE": DEFAULT_PID_INTEGRAL_ACCUMULATION_RANGE,
-        },
-        "FEEDFORWARD": {
-            "WIND_COEFF": DEFAULT_PID_FF_WIND_COEFF,
-            "TEMP_COEFF": DEFAULT_PID_FF_TEMP_COEFF,
-            "SUN_COEFF": DEFAULT_PID_FF_SUN_COEFF,
-            "WIND_CHILL_COEFF": DEFAULT_PID_FF_WIND_CHILL_COEFF,
-            "BASE_TEMP_REF_OUTSIDE": DEFAULT_PID_BASE_TEMP_REF_OUTSIDE,
-            "BASE_TEMP_BOILER": DEFAULT_PID_BASE_TEMP_BOILER,
-        },
-        "MQTT": {
-            "BROKER": "broker",
-            "PORT": 1883,
-            "RESET_IMMUNE": True,
-        },
-    }
+    import json
+    return json.loads(_FACTORY_JSON) # A fresh parse is the deep copy (no copy module on MicroPython)
+
+def factory_defaults():
+    """Returns the shared factory configuration, parsed on first use. Callers must not modify it;
+    use get_factory_config() for a copy that can be changed (as factory_reset() does)."""
+    global _factory_template
+    if _factory_template is None:
+        _factory_template = get_factory_config()
+    return _factory_template
+
 
 # --- Hardware Initialization Functions ---
-from machine import Pin, I2C
-from drivers.driver_mcp23017 import Portexpander, McpPin
-from drivers.driver_lcd import LCD
-from drivers.driver_HD44780 import LCD1602
-from drivers.driver_rgbled import RGBLED
-from controllers.controller_HID import HIDController
-from machine import unique_id
-import binascii
-from machine import UART
-import uos
-import time
-from machine import reset
-import json
+# Drivers are imported inside the functions that use them, so importing this module for
+# ConfigFileName()/factory_defaults() does not load the whole hardware stack
 from managers.manager_logger import Logger
 
 logger = Logger()
 
+_hardware_name = None # Set on the first unique_hardware_name() call; the board ID never changes
+
 def unique_hardware_name():
     """Generate a unique name for the device."""
-    try:
-        name=binascii.hexlify(unique_id())
-        return "OT-CTRL-"+name.decode()
-    except Exception as e:
-        return "OT-CTRL-GENERIC"
+    global _hardware_name
+    if _hardware_name is None:
+        try:
+            import binascii
+            from machine import unique_id
+            _hardware_name = "OT-CTRL-" + binascii.hexlify(unique_id()).decode()
+        except Exception:
+            _hardware_name = "OT-CTRL-GENERIC"
+    return _hardware_name
 
 def HWi2c(cfg):
     """Initialize I2C bus and return the instance."""
+    from machine import Pin, I2C
     i2c_cfg = cfg.get("HARDWARE", "I2C")
     return I2C(i2c_cfg["ID"], 
               sda=Pin(i2c_cfg["SDA_PIN"]), 
@@ -257,63 +76,91 @@ def HWi2c(cfg):
 
 def HWMCP(i2c, cfg):
     """Initialize MCP23017 I/O expander and return the instance."""
+    from drivers.driver_mcp23017 import Portexpander
     mcp_cfg = cfg.get("HARDWARE", "MCP")
     return Portexpander(i2c, mcp_cfg["ADDRESS"])
 
 def HWRGBLed(mcp, cfg):
     """Initialize RGB LED pins and return the RGBLED instance."""
+    from machine import Pin
+    from drivers.driver_mcp23017 import McpPin
+    from drivers.driver_rgbled import RGBLED
     led_cfg = cfg.get("HARDWARE", "RGBLED")
     use_mcp = led_cfg.get("MCPPIN", True)
     
     if use_mcp:
-        led_red = McpPin(mcp, led_cfg["RED_PIN"], McpPin.OUT)
-        led_green = McpPin(mcp, led_cfg["GREEN_PIN"], McpPin.OUT)
-        led_blue = McpPin(mcp, led_cfg["BLUE_PIN"], McpPin.OUT)
+        out = McpPin.OUT
+        mcp.begin_batch()
+        led_red = McpPin(mcp, led_cfg["RED_PIN"], out)
+        led_green = McpPin(mcp, led_cfg["GREEN_PIN"], out)
+        led_blue = McpPin(mcp, led_cfg["BLUE_PIN"], out)
+        mcp.commit()
     else:
-        led_red = Pin(led_cfg["RED_PIN"], Pin.OUT)
-        led_green = Pin(led_cfg["GREEN_PIN"], Pin.OUT)
-        led_blue = Pin(led_cfg["BLUE_PIN"], Pin.OUT)
+        out = Pin.OUT
+        led_red = Pin(led_cfg["RED_PIN"], out)
+        led_green = Pin(led_cfg["GREEN_PIN"], out)
+        led_blue = Pin(led_cfg["BLUE_PIN"], out)
     
     return RGBLED(led_red, led_green, led_blue, initial_color="yellow")
 
-def HWLCD(mcp, cfg) -> LCD:
+def HWLCD(mcp, cfg):
     """Initialize LCD pins and return an LCD instance."""
+    from machine import Pin
+    from drivers.driver_mcp23017 import McpPin
+    from drivers.driver_HD44780 import LCD1602
     lcd_cfg = cfg.get("HARDWARE", "LCD")
     use_mcp = lcd_cfg.get("MCPPIN", True)
     
     if use_mcp:
-        lcd_rw = McpPin(mcp, lcd_cfg["RW_PIN"], McpPin.OUT)
-        lcd_rs = McpPin(mcp, lcd_cfg["RS_PIN"], McpPin.OUT)
-        lcd_en = McpPin(mcp, lcd_cfg["EN_PIN"], McpPin.OUT)
-        lcd_d4 = McpPin(mcp, lcd_cfg["D4_PIN"], McpPin.OUT)
-        lcd_d5 = McpPin(mcp, lcd_cfg["D5_PIN"], McpPin.OUT)
-        lcd_d6 = McpPin(mcp, lcd_cfg["D6_PIN"], McpPin.OUT)
-        lcd_d7 = McpPin(mcp, lcd_cfg["D7_PIN"], McpPin.OUT)
+        out = McpPin.OUT
+        mcp.begin_batch() # Seven pins, configured in one direction write
+        lcd_rw = McpPin(mcp, lcd_cfg["RW_PIN"], out)
+        lcd_rs = McpPin(mcp, lcd_cfg["RS_PIN"], out)
+        lcd_en = McpPin(mcp, lcd_cfg["EN_PIN"], out)
+        lcd_d4 = McpPin(mcp, lcd_cfg["D4_PIN"], out)
+        lcd_d5 = McpPin(mcp, lcd_cfg["D5_PIN"], out)
+        lcd_d6 = McpPin(mcp, lcd_cfg["D6_PIN"], out)
+        lcd_d7 = McpPin(mcp, lcd_cfg["D7_PIN"], out)
+        mcp.commit()
     else:
-        lcd_rw = Pin(lcd_cfg["RW_PIN"], Pin.OUT)
-        lcd_rs = Pin(lcd_cfg["RS_PIN"], Pin.OUT)
-        lcd_en = Pin(lcd_cfg["EN_PIN"], Pin.OUT)
-        lcd_d4 = Pin(lcd_cfg["D4_PIN"], Pin.OUT)
-        lcd_d5 = Pin(lcd_cfg["D5_PIN"], Pin.OUT)
-        lcd_d6 = Pin(lcd_cfg["D6_PIN"], Pin.OUT)
-        lcd_d7 = Pin(lcd_cfg["D7_PIN"], Pin.OUT)
+        out = Pin.OUT
+        lcd_rw = Pin(lcd_cfg["RW_PIN"], out)
+        lcd_rs = Pin(lcd_cfg["RS_PIN"], out)
+        lcd_en = Pin(lcd_cfg["EN_PIN"], out)
+        lcd_d4 = Pin(lcd_cfg["D4_PIN"], out)
+        lcd_d5 = Pin(lcd_cfg["D5_PIN"], out)
+        lcd_d6 = Pin(lcd_cfg["D6_PIN"], out)
+        lcd_d7 = Pin(lcd_cfg["D7_PIN"], out)
     
     return LCD1602(lcd_rw, lcd_rs, lcd_en, lcd_d4, lcd_d5, lcd_d6, lcd_d7, 
                   cols=lcd_cfg["COLS"], rows=lcd_cfg["ROWS"])
 
 def HWButtons(mcp, cfg):
     """Initialize button pins and return the HIDController instance."""
+    from machine import Pin
+    from drivers.driver_mcp23017 import McpPin
+    from controllers.controller_HID import HIDController
     btn_cfg = cfg.get("HARDWARE", "BUTTONS")
     use_mcp = btn_cfg.get("MCPPIN", True)
+    irq_pin = None
     
     if use_mcp:
         pin_mode = McpPin.IN
         pull_mode = McpPin.PULL_UP
+        mcp.begin_batch()
         button_left = McpPin(mcp, btn_cfg["LEFT_PIN"], pin_mode, pull_mode)
         button_up = McpPin(mcp, btn_cfg["UP_PIN"], pin_mode, pull_mode)
         button_down = McpPin(mcp, btn_cfg["DOWN_PIN"], pin_mode, pull_mode)
         button_right = McpPin(mcp, btn_cfg["RIGHT_PIN"], pin_mode, pull_mode)
         button_select = McpPin(mcp, btn_cfg["SELECT_PIN"], pin_mode, pull_mode)
+        mcp.commit()
+        # Optional: host GPIO wired to the MCP INTA/INTB line, lets the button task sleep until a change
+        int_pin = btn_cfg.get("INT_PIN")
+        if int_pin is not None:
+            for key in ("LEFT_PIN", "UP_PIN", "DOWN_PIN", "RIGHT_PIN", "SELECT_PIN"):
+                mcp.set_interrupt_on_change(btn_cfg[key], True)
+            mcp.set_interrupt_mirror(True)
+            irq_pin = Pin(int_pin, Pin.IN, Pin.PULL_UP)
     else:
         pin_mode = Pin.IN
         pull_mode = Pin.PULL_UP
@@ -323,16 +170,17 @@ def HWButtons(mcp, cfg):
         button_right = Pin(btn_cfg["RIGHT_PIN"], pin_mode, pull_mode)
         button_select = Pin(btn_cfg["SELECT_PIN"], pin_mode, pull_mode)
     
-    return HIDController(button_left, button_up, button_down, button_right, button_select)
+    return HIDController(button_left, button_up, button_down, button_right, button_select, irq_pin)
 
 def HWUART(cfg):
     """Initialize UART and return the instance."""
+    from machine import Pin, UART
     uart_cfg = cfg.get("HARDWARE", "UART")
     return UART(uart_cfg["ID"], 
                baudrate=uart_cfg["BAUDRATE"],
                tx=Pin(uart_cfg["TX_PIN"]), 
                rx=Pin(uart_cfg["RX_PIN"]), 
-               timeout=10, timeout_char=10)
+               timeout=_UART_TIMEOUT_MS, timeout_char=_UART_TIMEOUT_MS)
 
 def ConfigFileName():
     """Returns the appropriate configuration filename (now JSON)."""
@@ -340,6 +188,11 @@ def ConfigFileName():
 
 def factory_reset(display, led):
     """Performs a factory reset while preserving sections marked as RESET_IMMUNE."""
+    import gc
+    import uos
+    import time
+    import json
+    from machine import reset
     cache_file = "hm_device_cache.json"
 
     logger.info("--- Factory Reset Initiated ---")
@@ -351,7 +204,7 @@ def factory_reset(display, led):
         uos.remove(cache_file)
         logger.info(f"Deleted cache file: {cache_file}")
     except OSError as e:
-        if e.args[0] == 2:  # ENOENT
+        if e.args[0] == _ENOENT:
             logger.warning(f"Cache file not found (already deleted?): {cache_file}")
         else:
             logger.error(f"Error deleting cache file {cache_file}: {e}")
@@ -361,36 +214,47 @@ def factory_reset(display, led):
     # 2. Load existing config to preserve immune sections
     preserved_config = {}
     try:
-        with open(ConfigFileName(), 'r') as f:
-            try:
-                current_config = json.load(f)
-                if isinstance(current_config, dict):
-                    # Preserve sections marked as RESET_IMMUNE
-                    for section, values in current_config.items():
-                        if isinstance(values, dict) and values.get("RESET_IMMUNE", False):
-                            preserved_config[section] = values
-            except json.JSONDecodeError:
-                logger.warning("Could not parse existing config, will use factory defaults")
+        with open(ConfigFileName(), 'rb') as f:
+            raw = f.read()
+        try:
+            current_config = json.loads(raw)
+            raw = None # Only the parse tree is needed from here on
+            if isinstance(current_config, dict):
+                # Preserve sections marked as RESET_IMMUNE
+                for section, values in current_config.items():
+                    if isinstance(values, dict) and values.get("RESET_IMMUNE", False):
+                        preserved_config[section] = values
+            current_config = None
+        except ValueError: # MicroPython's json has no JSONDecodeError
+            logger.warning("Could not parse existing config, will use factory defaults")
+        raw = None
     except OSError:
         logger.warning("Could not read existing config, will use factory defaults")
+    gc.collect() # Free the old config's text and parse tree before the factory template is built
 
     # 3. Create new config with factory defaults but preserve immune sections
     new_config = get_factory_config()
-    
-    # Override with preserved settings
+
+    # Swap the preserved sections in, patching each in place (the factory section is simply dropped)
     for section, values in preserved_config.items():
-        if section in new_config:
-            # Keep the RESET_IMMUNE flag from factory defaults
-            immune_flag = new_config[section].get("RESET_IMMUNE", False)
+        factory = new_config.get(section)
+        if factory is not None:
+            values["RESET_IMMUNE"] = factory.get("RESET_IMMUNE", False) # Keep the flag from factory defaults
             new_config[section] = values
-            new_config[section]["RESET_IMMUNE"] = immune_flag
+    preserved_config = None
+    gc.collect() # Drop the replaced factory sections so the write starts from a compacted heap
 
-    # 4. Write the new config
-    logger.info(f"Writing new config to {ConfigFileName()} (preserving immune sections)...")
+    # 4. Write the new config to a temp file and swap it in, so a crash mid-write leaves the old config intact
+    config_file = ConfigFileName()
+    tmp_file = config_file + ".tmp"
+    logger.info(f"Writing new config to {config_file} (preserving immune sections)...")
     try:
-        with open(ConfigFileName(), 'w') as f:
-            json.dump(new_config, f)
-        logger.info(f"Successfully wrote new config to {ConfigFileName()}")
+        with open(tmp_file, 'w') as f:
+            json.dump(new_config, f)  # Serialises straight to the stream, no intermediate string
+            f.flush()
+        uos.rename(tmp_file, config_file)  # Atomic replace on littlefs
+        uos.sync()  # Commit to flash before the reboot below
+        logger.info(f"Successfully wrote new config to {config_file}")
 
         # 5. Final steps before reboot
         logger.info("Factory reset complete. Rebooting in 5 seconds...")
@@ -5,6 +5,7 @@ import time
 # Should match the server script
 SERVER_HOST = 'localhost'
 SERVER_PORT = 8123
+RECV_BUFFER_SIZE = 8192
 
 # --- Client Logic ---
 def run_client():
@@ -37,16 +38,25 @@ def run_client():
             return
 
         client_socket.settimeout(1.0) # Set timeout for receiving data
+        recv_into = client_socket.recv_into # Bound once, not looked up per read
+        _print = print
+        chunk = memoryview(bytearray(RECV_BUFFER_SIZE)) # Reused for every read
+        pending = bytearray() # Bytes of a line not yet terminated
 
         while True:
             try:
-                data = client_socket.recv(1024) # Read up to 1024 bytes
-                if not data:
-                    print("\nServer disconnected.")
+                n = recv_into(chunk)
+                if not n:
+                    _print("\nServer disconnected.")
                     break
-                # Decode assuming UTF-8 and print, removing potential trailing newline
-                message = data.decode('utf-8').strip()
-                print(f"Received: {message}")
+                pending += chunk[:n]
+                # The server ends each message with "\r\n"; a read may hold several or part of one
+                nl = pending.find(b"\n")
+                while nl >= 0:
+                    data = bytes(pending[:nl])
+                    del pending[:nl + 1]
+                    _print("Received:", data.rstrip().decode('utf-8'))
+                    nl = pending.find(b"\n")
             except TimeoutError: # Correct exception for socket timeouts
                 # No data received within timeout, just continue listening
                 continue
@@ -28,6 +28,7 @@ class MockUasyncio:
 
     # Lock needs to be instantiated. Map the class directly.
     Lock = asyncio.Lock
+    ThreadSafeFlag = asyncio.Event
 
     @staticmethod
     async def start_server(callback, host, port, backlog=5):
@@ -64,6 +65,11 @@ class MockUsocket:
 sys.modules['machine'] = MockMachine() # type: ignore
 sys.modules['uasyncio'] = MockUasyncio # type: ignore
 sys.modules['usocket'] = MockUsocket() # type: ignore
+sys.modules['uos'] = os # Same stat/remove API for the logger's file handling
+# MicroPython tick helpers used by the logger's error-rate window; patched onto the real module,
+# since asyncio itself needs CPython's time
+time.ticks_ms = lambda: int(time.monotonic() * 1000)
+time.ticks_diff = lambda new, old: new - old
 
 # --- Import Project Code ---
 # Now these imports should find the mocks for MicroPython modules
@@ -74,7 +80,16 @@ from lib.services.service_messageserver import MessageServer
 TEST_HOST = 'localhost'
 TEST_PORT = 23 # Use a non-standard port to avoid conflicts
 LOGGER_FILE = "log.txt"
-ERROR_FILE = "lasterror.json"
+ERROR_FILE = "fatal.log"
+SEND_INTERVAL_S = 2
+# Messages sent each round, built once (Logger formats str; bytes would print as b'...')
+TRACE_MSG = "This is a trace message."
+DEBUG_MSG = "This is a debug message."
+INFO_MSG = "This is an info message."
+WARNING_MSG = "This is a warning message."
+ERROR_MSG = "This is an error message."
+FATAL_TYPE = "TestError"
+FATAL_MSG = "This is a fatal error message."
 
 # --- Test Runner ---
 async def main():
@@ -111,20 +126,16 @@ async def main():
     print("--- Server running. Send test messages: ---")
     await asyncio.sleep(10) # Wait for client to connect
     # 5. Send test logs
+    trace, debug, info = logger.trace, logger.debug, logger.info
+    warning, error, fatal = logger.warning, logger.error, logger.fatal
     while True:
-        logger.trace("This is a trace message.")
-        # await asyncio.sleep(0.1)
-        logger.debug("This is a debug message.")
-        # await asyncio.sleep(0.1)
-        logger.info("This is an info message.")
-        # await asyncio.sleep(0.1)
-        logger.warning("This is a warning message.")
-        # await asyncio.sleep(0.1)
-        logger.error("This is an error message.")
-        # await asyncio.sleep(0.1)
-        logger.fatal("TestError", "This is a fatal error message.", resetmachine=False)
-        # await asyncio.sleep(0.1)
-        await asyncio.sleep(2)
+        trace(TRACE_MSG)
+        debug(DEBUG_MSG)
+        info(INFO_MSG)
+        warning(WARNING_MSG)
+        error(ERROR_MSG)
+        fatal(FATAL_TYPE, FATAL_MSG, resetmachine=False)
+        await asyncio.sleep(SEND_INTERVAL_S) # One scheduling point per round
     print("--- Test messages sent. Run test_client.py now. ---")
     print("--- Press Ctrl+C to stop the server ---       ")
 
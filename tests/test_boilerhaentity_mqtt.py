@@ -1,117 +1,78 @@
 # mqtt_test.py
 import uasyncio as asyncio
 import utime as time
-import machine
-import ubinascii
 import gc
+from micropython import const
 
-# Import WiFi Manager and Config Manager
+# Import WiFi Manager; the config and MQTT stacks are imported where they are first needed
 from managers.manager_wifi import WiFiManager
-from managers.manager_config import ConfigManager
+from main_tasks import periodic
 
-# Assuming service_mqtt.py is in the same directory or /lib
-from platform_spec import ConfigFileName
-from services.boilerhaentity import BoilerController
-
-
-# Load configuration
-config = None
-try:
-    if ConfigManager is not None:
-        config = ConfigManager(ConfigFileName(), ConfigFileName(factory=True))
-        WIFI_SSID = config.get("WIFI", "SSID")
-        WIFI_PASS = config.get("WIFI", "PASS")
-    else:
-        WIFI_SSID = None
-        WIFI_PASS = None
-except Exception as e:
-    print(f"Error loading config: {e}")
-    WIFI_SSID = None
-    WIFI_PASS = None
 
 # --- MQTT Configuration --- (!!! REPLACE WITH YOUR DETAILS !!!)
 MQTT_BROKER = "10.9.30.11" # e.g., "192.168.1.100" or "test.mosquitto.org"
 MQTT_PORT = 1883
 MQTT_USER = "mqtt"  # Set to your username if required, e.g., "mqtt_user"
 MQTT_PASSWORD = "11c244f3508fd720661dd69aa1f5c31c" # Set to your password if required, e.g., "mqtt_password"
+BASE_TOPIC = "mydevice/boiler"
+_DEBUG = const(0) # 1: print a status line every loop; 0 lets the compiler drop it
 # ---------------------
 
-async def wifi_update(wifi_service):
-    """Asynchronous function to update WiFi connection status."""
-    while True:
-        try:
-            wifi_service.update()
-        except Exception as e:
-            print(f"Error in wifi_update: {e}")
-        await asyncio.sleep(5) # Check WiFi status every 5 seconds
+def load_wifi_credentials():
+    """Reads (ssid, password) from the config; the parse temporaries are freed before tasks start."""
+    try:
+        from managers.manager_config import ConfigManager
+        from platform_spec import ConfigFileName, factory_defaults
+        config = ConfigManager(ConfigFileName(), factory_defaults())
+        credentials = (config.get("WIFI", "SSID"), config.get("WIFI", "PASS"))
+    except Exception as e:
+        print(f"Error loading config: {e}")
+        credentials = (None, None)
+    config = None
+    gc.collect()
+    return credentials
 
 async def main():
     # Check for required services
-    
+    WIFI_SSID, WIFI_PASS = load_wifi_credentials()
+    # Collect proactively once a quarter of the free heap has been allocated, not only on allocation failure
+    gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
     if None in (WIFI_SSID, WIFI_PASS):
         print("WiFi credentials not configured in config.txt. Please edit the file.")
         return
 
 
-    # Initialize WiFi
+    # Long-lived objects first, so short-lived task frames are not allocated in front of them
     print("Initializing WiFi...")
     if WiFiManager is None:
         print("WiFiManager not available. Exiting.")
         return
     wifi_service = WiFiManager(WIFI_SSID, WIFI_PASS, f"mqtt-test")
-    
+    from services.boilerhaentity import BoilerController # Not loaded when the script exits early
+    # The MQTT client only connects in start(), so it can be built before WiFi is up
+    boiler = BoilerController(mqtt_broker=MQTT_BROKER, device_id="boiler-test", base_topic=BASE_TOPIC, mqtt_user=MQTT_USER, mqtt_pass=MQTT_PASSWORD)
+    gc.collect()
+
     # Create and start WiFi update task
-    wifi_task = asyncio.create_task(wifi_update(wifi_service))
+    wifi_task = asyncio.create_task(periodic("WiFi", wifi_service.update, 5000)) # Check WiFi status every 5 seconds
     print("WiFi update task created.")
 
     # Wait for initial WiFi connection
     print("Waiting for WiFi connection...")
     while not wifi_service.is_connected():
-        await asyncio.sleep(1)
+        await asyncio.sleep_ms(1000)
     print(f"WiFi connected! IP: {wifi_service.get_ip()}")
 
-    # Instantiate the MQTT Service
-    # Using print for error callback for simplicity in this test file
-    
-
-
-    boiler = BoilerController(mqtt_broker=MQTT_BROKER, device_id="boiler-test", base_topic="mydevice/boiler", mqtt_user=MQTT_USER, mqtt_pass=MQTT_PASSWORD)
-
     asyncio.create_task(boiler.start())
 
 
     # --- Main Test Loop ---
     counter = 0
-    last_config_publish_time = time.ticks_ms()
 
     while True:
-        gc.collect() # Collect garbage periodically
-
-        # 1. Check Connection Status (Informational)
-        # is_connected = mqtt_service.is_connected()
-        # print(f"Loop {counter} | MQTT Connected: {is_connected} | WiFi Connected: {wifi_service.is_connected()} | Mem Free: {gc.mem_free()}")
-
-        # # 2. Get Data from Listener Topics
-        # command = mqtt_service.get(f"{base_topic}/command")
-        # if command is not None and command != "": # Check for non-empty command
-        #     print(f"---> Received Command: '{command}'")
-        #     # Example action: Clear the command topic after processing
-        #     mqtt_service.set(f"{base_topic}/command", "") # Set empty string to clear
-        #     if command == "reboot":
-        #         print("Reboot command received! (Simulated)")
-        #         # machine.reset() # Uncomment to actually reboot
-
-        # new_config = mqtt_service.get(f"{base_topic}/config/set")
-        # if new_config is not None:
-        #     print(f"---> Received New Config: {new_config}")
-        #     # Update our 'current' config publisher
-        #     mqtt_service.set(f"{base_topic}/config/current", new_config)
-
-        # # 3. Set Data for Publisher Topics
-        # mqtt_service.set(f"{base_topic}/counter", counter)
-
-        # 4. Wait
-        await asyncio.sleep(5) # Main loop interval
+        if _DEBUG:
+            print(f"Loop {counter} | WiFi Connected: {wifi_service.is_connected()} | Mem Free: {gc.mem_free()}")
+        await asyncio.sleep_ms(5000) # Main loop interval
         counter += 1
 
 # Run the main async function
@@ -2,7 +2,7 @@
 import uasyncio
 import time
 import sys
-import select
+import re
 from controllers.controller_otgw import OpenThermController # Keep controller import for instantiation
 from managers.manager_otgw import OpenThermManager, CMD_STATUS_PENDING, CMD_STATUS_SUCCESS # Import Manager
 from managers.manager_logger import Logger
@@ -14,201 +14,319 @@ error_manager = Logger()
 # Set a debug level (0=Off, 1=Warnings/Errors, 2=Info, 3=Verbose)
 DEBUG_LEVEL = 2
 PRINT_INTERVAL_S = 5 # How often to print status
+# HH:MM for the thermostat clock; MicroPython's re has no {m,n} repetition
+_TIME_RE = re.compile(r"^(\d\d?):(\d\d)$")
 
 # --- Helper to format values --- (Simplified)
+def _format_flags(value):
+    # Basic dict formatting, could be expanded
+    active_flags = [name for name, val in value.items() if val == 1]
+    return "[%s]" % (", ".join(active_flags) or "None")
+
+# Keyed on the exact type, so bool does not fall into an int/float branch
+_FORMATTERS = {
+    float: lambda value: "%.2f" % value,
+    bool: lambda value: "ON" if value else "OFF",
+    dict: _format_flags,
+}
+
 def format_value(value):
     if value is None:
         return "N/A"
-    if isinstance(value, float):
-        return f"{value:.2f}"
-    if isinstance(value, bool):
-        return "ON" if value else "OFF"
-    if isinstance(value, dict):
-        # Basic dict formatting, could be expanded
-        active_flags = [name for name, val in value.items() if val == 1]
-        return f"[{', '.join(active_flags) or 'None'}]"
-    return str(value)
+    formatter = _FORMATTERS.get(type(value))
+    return formatter(value) if formatter else str(value)
+
+# Menu text, built once and shown with a single logger call
+_MENU = (
+    "\n--- Menu ---\n"
+    "1. Take Control (CS=40) - Note: Currently Blocks\n"
+    "2. Relinquish Control (CS=0)\n"
+    "3. Set Control Setpoint (CS)\n"
+    "4. Set DHW Setpoint (SW)\n"
+    "5. Set Max Modulation (MM)\n"
+    "6. Toggle Central Heating (CH)\n"
+    "7. Toggle Hot Water Mode (HW=1/0)\n"
+    "8. Set Max CH Setpoint (SH)\n"
+    "9. Set Ventilation (VS %)\n"
+    "10. Set Control Setpoint 2 (C2)\n"
+    "11. Toggle CH2 Enable (H2)\n"
+    "R. Reset Boiler Counter (RS)\n"
+    "P. Request Priority Message (PM)\n"
+    "--- Thermostat Overrides ---\n"
+    "T. Set Temporary Room Setpoint (TT)\n"
+    "C. Set Constant Room Setpoint (TC)\n"
+    "S. Set Thermostat Clock (SC)\n"
+    "L. Show Last Command Statuses\n"
+    "M. Show Menu\n"
+    "Enter choice:"
+)
+
+# Status report, filled by status_task with one % operation per print
+_STATUS_FMT = (
+    "\n--- Status ---\n"
+    # --- Basic Status & Flags ---
+    "  Boiler Connected:  %s\n"
+    "  Controller Active: %s\n"
+    "  Fault Present:     %s\n"
+    "  CH Enabled:        %s\n"
+    "  DHW Enabled:       %s\n"
+    "  Flame On:          %s\n"
+    "  Cooling Enabled:   %s\n"
+    # "  CH2 Enabled:       %s\n" # TODO: Add getter proxy
+    "  Fault Flags:       %s\n"
+    "  OEM Fault Code:    %s\n"
+    # --- Temperatures ---
+    "  ---------------- Temperatures ----------------\n"
+    "  Room Temp:         %s C\n"
+    "  Boiler Water Temp: %s C\n"
+    "  DHW Temp:          %s C\n"
+    "  Outside Temp:      %s C\n"
+    "  Return Water Temp: %s C\n"
+    # --- Setpoints ---
+    "  ---------------- Setpoints -------------------\n"
+    "  Control Setpoint:  %s C\n"
+    "  Control Setpoint2: %s C\n"
+    "  Room Setpoint:     %s C\n"
+    "  DHW Setpoint:      %s C\n"
+    "  Max CH Setpoint:   %s C\n"
+    # --- Modulation & Other ---
+    "  ---------------- Modulation & Other ----------\n"
+    "  Modulation Level:  %s %%\n"
+    "  Max Modulation:    %s %%\n"
+    "  Ventilation Level: %s %%\n"
+    "  CH Water Pressure: %s bar"
+)
 
 def print_menu():
-    error_manager.info("\n--- Menu ---")
-    error_manager.info("1. Take Control (CS=40) - Note: Currently Blocks")
-    error_manager.info("2. Relinquish Control (CS=0)")
-    error_manager.info("3. Set Control Setpoint (CS)")
-    error_manager.info("4. Set DHW Setpoint (SW)")
-    error_manager.info("5. Set Max Modulation (MM)")
-    error_manager.info("6. Toggle Central Heating (CH)")
-    error_manager.info("7. Toggle Hot Water Mode (HW=1/0)")
-    error_manager.info("8. Set Max CH Setpoint (SH)")
-    error_manager.info("9. Set Ventilation (VS %)")
-    error_manager.info("10. Set Control Setpoint 2 (C2)")
-    error_manager.info("11. Toggle CH2 Enable (H2)")
-    error_manager.info("R. Reset Boiler Counter (RS)")
-    error_manager.info("P. Request Priority Message (PM)")
-    error_manager.info("--- Thermostat Overrides ---")
-    error_manager.info("T. Set Temporary Room Setpoint (TT)")
-    error_manager.info("C. Set Constant Room Setpoint (TC)")
-    error_manager.info("S. Set Thermostat Clock (SC)")
-    error_manager.info("L. Show Last Command Statuses") # New option
-    error_manager.info("M. Show Menu")
-    error_manager.info("Enter choice:")
-
-
-# Changed function signature to accept manager
-# Reverted: No longer async, as manager methods are likely synchronous wrappers
+    error_manager.info(_MENU)
+
+
+def _ask(prompt, conv=float, error="  Invalid temperature.", lo=None, hi=None):
+    """Reads a number from the console; logs error and returns None if it does not parse or is out of range."""
+    try:
+        value = conv(input(prompt))
+    except ValueError:
+        error_manager.error(error)
+        return None
+    if lo is not None and not lo <= value <= hi:
+        error_manager.error(f"  Value must be between {lo} and {hi}.")
+        return None
+    return value
+
+# --- Command handlers: each returns True if a command task was launched ---
+def _cmd_take_control(manager):
+    error_manager.info("Attempting to take control (non-blocking)...")
+    # The command runs in the background. Check status with 'L' later.
+    return manager.take_control()
+
+def _cmd_relinquish_control(manager):
+    error_manager.info("Attempting to relinquish control...")
+    return manager.relinquish_control()
+
+def _cmd_setpoint(prompt, code, setter_name):
+    """Builds a handler that asks for a float setpoint and passes it to manager.<setter_name>."""
+    def handler(manager):
+        value = _ask(prompt)
+        if value is None:
+            return False
+        error_manager.info(f"Requesting set {code} to {value}...")
+        return getattr(manager, setter_name)(value)
+    return handler
+
+def _cmd_percentage(prompt, code, setter_name, unit=""):
+    """Builds a handler that asks for a 0-100 integer and passes it to manager.<setter_name>."""
+    def handler(manager):
+        value = _ask(prompt, int, "  Invalid percentage.", 0, 100)
+        if value is None:
+            return False
+        error_manager.info(f"Requesting set {code} to {value}{unit}...")
+        return getattr(manager, setter_name)(value)
+    return handler
+
+def _cmd_toggle_ch(manager):
+    if not manager.is_active():
+        error_manager.error("  Cannot toggle CH, controller not active.")
+        return False
+    current_state = manager.is_ch_enabled()
+    new_state = not current_state
+    error_manager.info(f"Requesting toggle CH from {format_value(current_state)} to {format_value(new_state)}...")
+    return manager.set_central_heating(new_state)
+
+def _cmd_toggle_hw(manager):
+    current_state = manager.is_dhw_enabled()
+    new_state_bool = not current_state
+    new_state_cmd = 1 if new_state_bool else 0
+    error_manager.info(f"Requesting toggle HW Enable from {format_value(current_state)} to {format_value(new_state_bool)} (Using HW={new_state_cmd})...")
+    return manager.set_hot_water_mode(new_state_cmd)
+
+def _cmd_toggle_ch2(manager):
+    if not manager.is_active():
+        error_manager.error("  Cannot toggle CH2, controller not active.")
+        return False
+    # TODO: Add manager.is_ch2_enabled() proxy
+    error_manager.info("Toggling CH2 (requires getter - placeholder: setting H2=0)...")
+    return manager.set_central_heating_2(False)
+
+def _cmd_reset_counter(manager):
+    try:
+        error_manager.info("  Valid counters: HBS, HBH, HPS, HPH, WBS, WBH, WPS, WPH")
+        counter_name = input("  Enter counter name to reset: ").strip().upper()
+        error_manager.info(f"Requesting reset counter {counter_name}...")
+        return manager.reset_boiler_counter(counter_name)
+    except Exception as e:
+        error_manager.error(f"  Error getting input: {e}")
+        return False
+
+def _cmd_priority_message(manager):
+    value = _ask("  Enter Data ID to request (0-255): ", int, "  Invalid Data ID.")
+    if value is None:
+        return False
+    error_manager.info(f"Requesting priority message for ID {value}...")
+    return manager.request_priority_message(value)
+
+def _cmd_room_override(prompt, code, setter_name):
+    """Builds a handler for the TT/TC room setpoint overrides."""
+    def handler(manager):
+        value = _ask(prompt)
+        if value is None:
+            return False
+        error_manager.info(f"Requesting set {code} to {value:.2f}...")
+        return getattr(manager, setter_name)(value)
+    return handler
+
+def _cmd_set_clock(manager):
+    try:
+        m = _TIME_RE.match(input("  Enter Time (HH:MM): ").strip())
+        if not m:
+            raise ValueError
+        hh, mm = int(m.group(1)), int(m.group(2))
+        if hh > 23 or mm > 59:
+            raise ValueError
+        time_str = "%02d:%02d" % (hh, mm)
+        day_int = int(input("  Enter Day of Week (1=Mon, 7=Sun): "))
+        error_manager.info(f"Requesting set SC to {time_str} / {day_int}...")
+        return manager.set_thermostat_clock(time_str, day_int)
+    except ValueError:
+        error_manager.error("  Invalid day or time format.")
+    except Exception as e:
+         error_manager.error(f"  Error setting clock: {e}")
+    return False
+
+def _cmd_show_statuses(manager):
+    error_manager.info("\n--- Last Command Statuses ---")
+    listed = False
+    for code, (status, result, err_code, ts) in manager.command_states():
+        error_manager.info(f"  {code:<5}: {status:<10} Err:{err_code!s:<5} Res:{result!s:<20} @ {ts:.0f}")
+        listed = True
+    if not listed:
+        error_manager.info("  No commands issued yet.")
+    return False # No task launched for this command
+
+COMMANDS = {
+    '1': _cmd_take_control,
+    '2': _cmd_relinquish_control,
+    '3': _cmd_setpoint("  Enter Control Setpoint (e.g., 55.0): ", "CS", "set_control_setpoint"),
+    '4': _cmd_setpoint("  Enter DHW Setpoint (e.g., 48.0): ", "SW", "set_dhw_setpoint"),
+    '5': _cmd_percentage("  Enter Max Modulation (0-100): ", "MM", "set_max_modulation"),
+    '6': _cmd_toggle_ch,
+    '7': _cmd_toggle_hw,
+    '8': _cmd_setpoint("  Enter Max CH Setpoint (e.g., 75.0, 0=auto): ", "SH", "set_max_ch_setpoint"),
+    '9': _cmd_percentage("  Enter Ventilation Setpoint (0-100%): ", "VS", "set_ventilation_setpoint", "%"),
+    '10': _cmd_setpoint("  Enter Control Setpoint 2 (e.g., 40.0): ", "C2", "set_control_setpoint_2"),
+    '11': _cmd_toggle_ch2,
+    'r': _cmd_reset_counter,
+    'p': _cmd_priority_message,
+    't': _cmd_room_override("  Enter Temporary Setpoint (0.0-30.0, 0=cancel): ", "TT", "set_temporary_room_setpoint_override"),
+    'c': _cmd_room_override("  Enter Constant Setpoint (0.0-30.0, 0=cancel): ", "TC", "set_constant_room_setpoint_override"),
+    's': _cmd_set_clock,
+    'l': _cmd_show_statuses,
+    'm': lambda manager: print_menu(), # Returns None: nothing launched
+}
+
 def process_command(cmd, manager: OpenThermManager):
     """Process the user's menu command using the OpenThermManager."""
     cmd = cmd.strip().lower()
     error_manager.info(f"\nProcessing command: '{cmd}'")
-    launched = False # Flag to indicate if a command task was launched
-    # command_successful = None # Reverted
-
-    if cmd == '1':
-        error_manager.info("Attempting to take control (non-blocking)...")
-        # Call the non-blocking manager method
-        launched = manager.take_control()
-        # The command now runs in the background. Check status with 'L' later.
-        # manager.take_control(initial_setpoint=40.0)
-        # TODO: Manager should ideally return True/False if task was launched - DONE
-    elif cmd == '2':
-        error_manager.info("Attempting to relinquish control...")
-        # Call the manager method directly
-        launched = manager.relinquish_control()
-        # command_successful = (status_code == 0) # Reverted
-        # print(f"  Relinquish Control Result: Status={status_code}, Response='{response_data}'") # Reverted
-    elif cmd == '3':
-        try:
-            value = float(input("  Enter Control Setpoint (e.g., 55.0): "))
-            error_manager.info(f"Requesting set CS to {value}...")
-            launched = manager.set_control_setpoint(value)
-        except ValueError:
-            error_manager.error("  Invalid temperature.")
-    elif cmd == '4':
-        try:
-            value = float(input("  Enter DHW Setpoint (e.g., 48.0): "))
-            error_manager.info(f"Requesting set SW to {value}...")
-            launched = manager.set_dhw_setpoint(value)
-        except ValueError:
-            error_manager.error("  Invalid temperature.")
-    elif cmd == '5':
-        try:
-            value = int(input("  Enter Max Modulation (0-100): "))
-            if 0 <= value <= 100:
-                error_manager.info(f"Requesting set MM to {value}...")
-                launched = manager.set_max_modulation(value)
-            else:
-                error_manager.error("  Value must be between 0 and 100.")
-        except ValueError:
-            error_manager.error("  Invalid percentage.")
-    elif cmd == '6': # Toggle CH - Use manager's proxied getter
-        if manager.is_active():
-            current_state = manager.is_ch_enabled()
-            new_state = not current_state
-            error_manager.info(f"Requesting toggle CH from {format_value(current_state)} to {format_value(new_state)}...")
-            launched = manager.set_central_heating(new_state)
-        else:
-            error_manager.error("  Cannot toggle CH, controller not active.")
-    elif cmd == '7': # Toggle HW - Use manager's proxied getter
-         current_state = manager.is_dhw_enabled()
-         new_state_bool = not current_state
-         new_state_cmd = 1 if new_state_bool else 0
-         error_manager.info(f"Requesting toggle HW Enable from {format_value(current_state)} to {format_value(new_state_bool)} (Using HW={new_state_cmd})...")
-         launched = manager.set_hot_water_mode(new_state_cmd)
-    elif cmd == '8':
-        try:
-            value = float(input("  Enter Max CH Setpoint (e.g., 75.0, 0=auto): "))
-            error_manager.info(f"Requesting set SH to {value}...")
-            launched = manager.set_max_ch_setpoint(value)
-        except ValueError:
-            error_manager.error("  Invalid temperature.")
-    elif cmd == '9':
-        try:
-            value = int(input("  Enter Ventilation Setpoint (0-100%): "))
-            if 0 <= value <= 100:
-                error_manager.info(f"Requesting set VS to {value}%...")
-                launched = manager.set_ventilation_setpoint(value)
-            else:
-                error_manager.error("  Value must be between 0 and 100.")
-        except ValueError:
-            error_manager.error("  Invalid percentage.")
-    elif cmd == '10':
-        try:
-            value = float(input("  Enter Control Setpoint 2 (e.g., 40.0): "))
-            error_manager.info(f"Requesting set C2 to {value}...")
-            launched = manager.set_control_setpoint_2(value)
-        except ValueError:
-            error_manager.error("  Invalid temperature.")
-    elif cmd == '11': # Toggle CH2 Enable (H2)
-        if manager.is_active():
-            # TODO: Add manager.is_ch2_enabled() proxy
-            error_manager.info("Toggling CH2 (requires getter - placeholder: setting H2=0)...")
-            launched = manager.set_central_heating_2(False)
-        else:
-            error_manager.error("  Cannot toggle CH2, controller not active.")
-    elif cmd == 'r':
-        try:
-            error_manager.info("  Valid counters: HBS, HBH, HPS, HPH, WBS, WBH, WPS, WPH")
-            counter_name = input("  Enter counter name to reset: ").strip().upper()
-            error_manager.info(f"Requesting reset counter {counter_name}...")
-            launched = manager.reset_boiler_counter(counter_name)
-        except Exception as e:
-            error_manager.error(f"  Error getting input: {e}")
-    elif cmd == 'p':
-        try:
-            value = int(input("  Enter Data ID to request (0-255): "))
-            error_manager.info(f"Requesting priority message for ID {value}...")
-            launched = manager.request_priority_message(value)
-        except ValueError:
-            error_manager.error("  Invalid Data ID.")
-    elif cmd == 't':
-        try:
-            value = float(input("  Enter Temporary Setpoint (0.0-30.0, 0=cancel): "))
-            error_manager.info(f"Requesting set TT to {value:.2f}...")
-            launched = manager.set_temporary_room_setpoint_override(value)
-        except ValueError:
-            error_manager.error("  Invalid temperature.")
-    elif cmd == 'c':
-        try:
-            value = float(input("  Enter Constant Setpoint (0.0-30.0, 0=cancel): "))
-            error_manager.info(f"Requesting set TC to {value:.2f}...")
-            launched = manager.set_constant_room_setpoint_override(value)
-        except ValueError:
-            error_manager.error("  Invalid temperature.")
-    elif cmd == 's':
-        try:
-            time_str = input("  Enter Time (HH:MM): ").strip()
-            day_int = int(input("  Enter Day of Week (1=Mon, 7=Sun): "))
-            error_manager.info(f"Requesting set SC to {time_str} / {day_int}...")
-            launched = manager.set_thermostat_clock(time_str, day_int)
-        except ValueError:
-            error_manager.error("  Invalid day or time format.")
-        except Exception as e:
-             error_manager.error(f"  Error setting clock: {e}")
-    elif cmd == 'l': # Show Last Command Statuses
-         error_manager.info("\n--- Last Command Statuses ---")
-         states = manager._command_states # Access internal state for display
-         if not states:
-             error_manager.info("  No commands issued yet.")
-         else:
-             for code, state_data in sorted(states.items()):
-                 status = state_data.get("status", "unknown")
-                 result = state_data.get("result", "")
-                 err_code = state_data.get("error_code")
-                 ts = state_data.get("last_update", 0)
-                 error_manager.info(f"  {code:<5}: {status:<10} Err:{err_code!s:<5} Res:{result!s:<20} @ {ts:.0f}")
-         # No task launched for this command
-    elif cmd == 'm':
-        pass
-    else:
+    handler = COMMANDS.get(cmd)
+    if handler is None:
         error_manager.error("  Unknown command.")
+        print_menu()
+        return
+    else:
+        launched = handler(manager)
 
     if launched:
         error_manager.info("  Command task launched successfully.")
     elif cmd not in ('m', 'l', '1'): # Don't print for menu, status list, or blocking take_control
         error_manager.error("  Command task NOT launched (maybe pending or invalid?).")
 
-    # No longer need sleep here, menu is printed after processing input
-    # await uasyncio.sleep_ms(100)
-    print_menu() # Show menu again after processing
+    if cmd != 'm':
+        error_manager.info("(Press 'm' for menu.)") # The full menu only on request
+
+async def stdin_task(manager):
+    """Runs one command per line read from stdin. Suspends until a full line has arrived;
+    echo and line editing are left to the terminal."""
+    readline = uasyncio.StreamReader(sys.stdin).readline
+    while True:
+        line = await readline()
+        if isinstance(line, bytes):
+            line = line.decode()
+        process_command(line.strip(), manager)
+
+async def status_task(manager):
+    """Prints the boiler status every PRINT_INTERVAL_S using the manager's proxy getters.
+    A print is skipped while no OpenTherm value and neither the connection nor the control state changed."""
+    # Bound once; each print would otherwise look up ~25 attributes
+    info = error_manager.info
+    fmt = format_value
+    is_boiler_connected = manager.is_boiler_connected
+    is_active = manager.is_active
+    is_fault_present = manager.is_fault_present
+    is_ch_enabled = manager.is_ch_enabled
+    is_dhw_enabled = manager.is_dhw_enabled
+    is_flame_on = manager.is_flame_on
+    is_cooling_enabled = manager.is_cooling_enabled
+    get_fault_flags = manager.get_fault_flags
+    get_oem_fault_code = manager.get_oem_fault_code
+    get_room_temperature = manager.get_room_temperature
+    get_boiler_water_temp = manager.get_boiler_water_temp
+    get_dhw_temperature = manager.get_dhw_temperature
+    get_outside_temperature = manager.get_outside_temperature
+    get_return_water_temp = manager.get_return_water_temp
+    get_control_setpoint = manager.get_control_setpoint
+    get_control_setpoint_2 = manager.get_control_setpoint_2
+    get_room_setpoint = manager.get_room_setpoint
+    get_dhw_setpoint = manager.get_dhw_setpoint
+    get_max_ch_water_setpoint = manager.get_max_ch_water_setpoint
+    get_relative_modulation = manager.get_relative_modulation
+    get_max_relative_modulation = manager.get_max_relative_modulation
+    get_ventilation_setpoint = manager.get_ventilation_setpoint
+    get_ch_water_pressure = manager.get_ch_water_pressure
+    take_dirty_ids = manager.take_dirty_ids
+    last_link = None # (boiler connected, controller active) at the last print
+    interval_ms = PRINT_INTERVAL_S * 1000
+    next_tick = time.ticks_ms()
+    while True:
+        link = (is_boiler_connected(), is_active())
+        if take_dirty_ids() or link != last_link:
+            last_link = link
+            oem = get_oem_fault_code() # Usually None: no fault reported yet
+            # One string and one logger call per status print, filled by a single % operation
+            info(_STATUS_FMT % (
+                fmt(link[0]), fmt(link[1]), fmt(is_fault_present()),
+                fmt(is_ch_enabled()), fmt(is_dhw_enabled()), fmt(is_flame_on()),
+                fmt(is_cooling_enabled()), fmt(get_fault_flags()), "N/A" if oem is None else "0x%02X" % oem,
+                fmt(get_room_temperature()), fmt(get_boiler_water_temp()), fmt(get_dhw_temperature()),
+                fmt(get_outside_temperature()), fmt(get_return_water_temp()),
+                fmt(get_control_setpoint()), fmt(get_control_setpoint_2()), fmt(get_room_setpoint()),
+                fmt(get_dhw_setpoint()), fmt(get_max_ch_water_setpoint()),
+                fmt(get_relative_modulation()), fmt(get_max_relative_modulation()),
+                fmt(get_ventilation_setpoint()), fmt(get_ch_water_pressure()),
+            ))
+
+        # Fixed-phase schedule: the time spent printing does not stretch the interval
+        next_tick = time.ticks_add(next_tick, interval_ms)
+        await uasyncio.sleep_ms(max(0, time.ticks_diff(next_tick, time.ticks_ms())))
 
 async def main():
     error_manager.info("Starting OTGW Controller Monitor Script...")
@@ -225,76 +343,12 @@ async def main():
     # Allow some time for UART connection - REMOVED, handled by manager.start()
     # await uasyncio.sleep(2)
 
-    last_print_time = time.time()
-    current_input = ""
-    spoll = select.poll()
-    spoll.register(sys.stdin, select.POLLIN)
-
     print_menu() # Initial menu display
+    # Status output and input handling run as separate tasks, each woken only by its own event
+    tasks = (uasyncio.create_task(status_task(manager)), uasyncio.create_task(stdin_task(manager)))
 
     try:
-        while True:
-            # --- Status Printing --- (Runs periodically using Manager's proxy getters)
-            current_time = time.time()
-            if current_time - last_print_time >= PRINT_INTERVAL_S:
-                error_manager.info(f"\n--- Status @ {current_time:.0f} ---")
-                # --- Basic Status & Flags ---
-                error_manager.info(f"  Boiler Connected:  {format_value(manager.is_boiler_connected())}")
-                error_manager.info(f"  Controller Active: {format_value(manager.is_active())}")
-                error_manager.info(f"  Fault Present:     {format_value(manager.is_fault_present())}")
-                error_manager.info(f"  CH Enabled:        {format_value(manager.is_ch_enabled())}")
-                error_manager.info(f"  DHW Enabled:       {format_value(manager.is_dhw_enabled())}")
-                error_manager.info(f"  Flame On:          {format_value(manager.is_flame_on())}")
-                error_manager.info(f"  Cooling Enabled:   {format_value(manager.is_cooling_enabled())}")
-                # print(f"  CH2 Enabled:       {format_value(manager.is_ch2_enabled())}") # TODO: Add getter proxy
-                error_manager.info(f"  Fault Flags:       {format_value(manager.get_fault_flags())}")
-                error_manager.info(f"  OEM Fault Code:    0x{manager.get_oem_fault_code() or 0:02X}")
-
-                # --- Temperatures ---
-                error_manager.info("  ---------------- Temperatures ----------------")
-                error_manager.info(f"  Room Temp:         {format_value(manager.get_room_temperature())} C")
-                error_manager.info(f"  Boiler Water Temp: {format_value(manager.get_boiler_water_temp())} C")
-                error_manager.info(f"  DHW Temp:          {format_value(manager.get_dhw_temperature())} C")
-                error_manager.info(f"  Outside Temp:      {format_value(manager.get_outside_temperature())} C")
-                error_manager.info(f"  Return Water Temp: {format_value(manager.get_return_water_temp())} C")
-
-                # --- Setpoints ---
-                error_manager.info("  ---------------- Setpoints -------------------")
-                error_manager.info(f"  Control Setpoint:  {format_value(manager.get_control_setpoint())} C")
-                error_manager.info(f"  Control Setpoint2: {format_value(manager.get_control_setpoint_2())} C")
-                error_manager.info(f"  Room Setpoint:     {format_value(manager.get_room_setpoint())} C")
-                error_manager.info(f"  DHW Setpoint:      {format_value(manager.get_dhw_setpoint())} C")
-                error_manager.info(f"  Max CH Setpoint:   {format_value(manager.get_max_ch_water_setpoint())} C")
-
-                # --- Modulation & Other ---
-                error_manager.info("  ---------------- Modulation & Other ----------")
-                error_manager.info(f"  Modulation Level:  {format_value(manager.get_relative_modulation())} %")
-                error_manager.info(f"  Max Modulation:    {format_value(manager.get_max_relative_modulation())} %")
-                error_manager.info(f"  Ventilation Level: {format_value(manager.get_ventilation_setpoint())} %")
-                error_manager.info(f"  CH Water Pressure: {format_value(manager.get_ch_water_pressure())} bar")
-
-                last_print_time = current_time
-
-            # --- Input Handling --- (existing)
-            # Check if input is available without blocking
-            if spoll.poll(0):
-                char = sys.stdin.read(1)
-                if char in ('\r', '\n'): # Enter key pressed
-                    # Pass manager to process_command now
-                    # Call synchronously
-                    process_command(current_input, manager)
-                    current_input = "" # Reset buffer
-                elif char == '\x08' or char == '\x7f': # Handle backspace/delete
-                     if current_input:
-                         current_input = current_input[:-1]
-                         sys.stdout.write('\b \b') # Erase char on screen
-                elif 32 <= ord(char) <= 126:
-                    current_input += char
-                    sys.stdout.write(char) # Echo printable characters
-
-            # Keep loop responsive
-            await uasyncio.sleep_ms(50)
-
+        await uasyncio.Event().wait() # Runs until interrupted
     except KeyboardInterrupt:
         error_manager.error("\nInterrupted by user.")
     except Exception as e:
@@ -302,7 +356,8 @@ async def main():
         sys.print_exception(e)
     finally:
         error_manager.info("\n--- Stopping Manager ---")
-        spoll.unregister(sys.stdin)
+        for task in tasks:
+            task.cancel()
         # Stop the manager, which stops the controller
         await manager.stop()
         error_manager.info("Manager stopped.")